@@ -1,9 +1,12 @@
 # Editing endpoints (auto-cut, analyze thoughts, train feedback)
+import asyncio
 import os
 import time
 import logging
-from typing import List
+from typing import List, Tuple
+import numpy as np
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 
 from db import Project, RoughCutResult, get_db
@@ -17,28 +20,57 @@ logger = logging.getLogger(__name__)
 router = APIRouter(tags=["editing"])
 
 
-@router.post("/auto-cut")
-async def auto_cut(request: AutoCutRequest, db: Session = Depends(get_db)):
+def _normalize_words(words: List[dict], ms_threshold: float) -> Tuple[List[dict], np.ndarray, np.ndarray]:
     """
-    Professional rough cut following industry-standard editing principles:
-    1. Silence & Pause Management (>2s removed)
-    2. Repetition Handling (keep LAST version)
-    3. "Cut That" Signal Processing
-    4. Incomplete Sentence Detection
+    Normalize client word dicts ('text' -> 'word', ms -> seconds) in a single pass.
+    Also returns float64 start/end arrays so the analyzers don't have to rebuild them.
     """
-    
-    # Normalize words to seconds if they are in ms
     normalized_words = []
-    for w in request.words:
+    starts = np.empty(len(words), dtype=np.float64)
+    ends = np.empty(len(words), dtype=np.float64)
+    
+    for i, w in enumerate(words):
         nw = w.copy()
         if 'word' not in nw and 'text' in nw:
             nw['word'] = nw['text']
             
-        if nw.get('start', 0) > 1000: # Simple heuristic: > 1000 means ms
+        if nw.get('start', 0) > ms_threshold:
             nw['start'] /= 1000.0
             nw['end'] /= 1000.0
             
+        starts[i] = nw['start']
+        ends[i] = nw['end']
         normalized_words.append(nw)
+        
+    return normalized_words, starts, ends
+
+
+def _run_rough_cut(words: List[dict], video_path, starts: np.ndarray, ends: np.ndarray) -> Tuple[List[dict], dict]:
+    """Run the rough-cut pipeline; returns (segments, statistics)."""
+    rough_cut = ProfessionalRoughCutV2(words, video_path=video_path, starts=starts, ends=ends)
+    segments = rough_cut.analyze()
+    return segments, rough_cut.get_statistics()
+
+
+def _group_thoughts(words: List[dict], starts: np.ndarray, ends: np.ndarray) -> Tuple[List[dict], dict]:
+    """Group words into thoughts; returns (thoughts, summary)."""
+    grouper = ThoughtGrouper(words, starts=starts, ends=ends)
+    thoughts = grouper.group_into_thoughts()
+    return thoughts, grouper.get_thought_summary()
+
+
+@router.post("/auto-cut")
+async def auto_cut(request: AutoCutRequest, db: Session = Depends(get_db)):
+    """
+    Professional rough cut following industry-standard editing principles:
+    1. Silence & Pause Management (>2s removed)
+    2. Repetition Handling (keep LAST version)
+    3. "Cut That" Signal Processing
+    4. Incomplete Sentence Detection
+    """
+    
+    # Normalize words to seconds if they are in ms (> 1000 means ms)
+    normalized_words, starts, ends = _normalize_words(request.words, ms_threshold=1000)
 
     # Run Professional Rough Cut Analysis
     video_path = None
@@ -50,9 +82,9 @@ async def auto_cut(request: AutoCutRequest, db: Session = Depends(get_db)):
     except Exception as e:
         logger.warning(f"Auto-cut: Could not find video path: {e}")
 
-    rough_cut = ProfessionalRoughCutV2(normalized_words, video_path=video_path)
-    segments = rough_cut.analyze()
-    stats = rough_cut.get_statistics()
+    # The analysis is CPU-bound (and loads audio); run it in a worker thread so the
+    # event loop keeps serving other requests (progress polls, media ranges) meanwhile
+    segments, stats = await asyncio.to_thread(_run_rough_cut, normalized_words, video_path, starts, ends)
     logger.info(f"Professional rough cut: {len(segments)} segments, "
                 f"{stats['reduction_percentage']}% reduction, "
                 f"{stats['time_saved']:.1f}s saved")
@@ -70,7 +102,7 @@ async def auto_cut(request: AutoCutRequest, db: Session = Depends(get_db)):
             wav_path = db_project.mediaPath + ".wav"
             if os.path.exists(wav_path):
                 import librosa
-                audio_buffer, _ = librosa.load(wav_path, sr=sr)
+                audio_buffer, _ = await asyncio.to_thread(librosa.load, wav_path, sr=sr)
     except Exception as e:
         logger.warning(f"Auto-cut: Could not load audio for snapping: {e}")
 
@@ -133,11 +165,11 @@ async def auto_cut(request: AutoCutRequest, db: Session = Depends(get_db)):
         logger.error(f"Failed to save rough cut results: {e}")
         db.rollback()
     
-    return {
+    return ORJSONResponse({
         "clips": clips,
         "words": request.words,
         "statistics": stats
-    }
+    })
 
 
 @router.get("/rough-cut-status/{project_id}")
@@ -183,22 +215,11 @@ async def analyze_thoughts(request: AnalyzeThoughtsRequest):
     Useful for visualizing how content will be grouped.
     """
     # Normalize words to seconds if needed
-    normalized_words = []
-    for w in request.words:
-        nw = w.copy()
-        if 'word' not in nw and 'text' in nw:
-            nw['word'] = nw['text']
-        
-        if nw.get('start', 0) > 10000:
-            nw['start'] /= 1000.0
-            nw['end'] /= 1000.0
-        
-        normalized_words.append(nw)
+    normalized_words, starts, ends = _normalize_words(request.words, ms_threshold=10000)
     
-    # Group into thoughts
-    grouper = ThoughtGrouper(normalized_words)
-    thoughts = grouper.group_into_thoughts()
-    summary = grouper.get_thought_summary()
+    # Group into thoughts. The pairwise repetition scoring is CPU-bound, so it runs
+    # in a worker thread like the rough cut, leaving the event loop free
+    thoughts, summary = await asyncio.to_thread(_group_thoughts, normalized_words, starts, ends)
     
     logger.info(f"Analyzed {len(thoughts)} thoughts from {len(normalized_words)} words")
     
@@ -269,9 +290,12 @@ async def export_edl(request: ExportEDLRequest, cleanup: bool = False, db: Sessi
     
     record_in = 0.0
     
+    # Index assets by id once instead of scanning the list for every clip
+    assets_by_id = {a.id: a for a in reversed(assets)}  # First asset wins on duplicate ids, as before
+    
     for idx, clip in enumerate(video_clips):
         # Find matching asset
-        asset = next((a for a in assets if a.id == clip.assetId), None)
+        asset = assets_by_id.get(clip.assetId)
         if not asset:
             continue
         
@@ -376,8 +400,10 @@ async def export_xml(request: ExportXMLRequest, cleanup: bool = False, db: Sessi
     
     from html import escape
     
+    assets_by_id = {a.id: a for a in reversed(assets)}
+    
     for idx, clip in enumerate(video_clips):
-        asset = next((a for a in assets if a.id == clip.assetId), None)
+        asset = assets_by_id.get(clip.assetId)
         if not asset:
             continue
         
@@ -6,6 +6,7 @@ import time
 import logging
 from typing import List
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Request, Form, BackgroundTasks
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from db import Project, Segment as DBSegment, RoughCutResult, get_db
@@ -60,10 +61,12 @@ def cleanup_orphaned_files(db: Session):
 
 import re
 
+_UNSAFE_FILENAME_CHARS = re.compile(r'[^a-zA-Z0-9_.-]')
+
 def secure_filename(filename: str) -> str:
     """Return a secure version of a filename for file system storage."""
     # Keep only alphanumeric, dot, dash, and underscore. Strip path dividers.
-    safe_name = re.sub(r'[^a-zA-Z0-9_.-]', '_', os.path.basename(filename))
+    safe_name = _UNSAFE_FILENAME_CHARS.sub('_', os.path.basename(filename))
     # Prevent empty or hidden-only names
     if not safe_name or safe_name.startswith('.'):
         safe_name = "upload_" + str(uuid.uuid4())[:8] + ".tmp"
@@ -208,7 +211,7 @@ def get_project(project_id: str, db: Session = Depends(get_db)):
     if not db_project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    return {
+    return ORJSONResponse({
         "projectId": db_project.id,
         "mediaPath": db_project.mediaPath,
         "duration": db_project.duration,
@@ -224,7 +227,7 @@ def get_project(project_id: str, db: Session = Depends(get_db)):
                 "isDeleted": s.isDeleted
             } for s in db_project.segments
         ]
-    }
+    })
 
 
 @router.delete("/project/{project_id}")
@@ -9,7 +9,7 @@ from fastapi.responses import FileResponse
 from core.limiter import limiter
 from sqlalchemy.orm import Session
 
-from db import Project, get_db
+from db import Project, Segment as DBSegment, get_db
 from schemas import UploadTranscriptRequest, ExportTranscriptRequest, TranscribeRequest
 from core import distribute_word_timestamps, refine_word_timestamps_with_audio
 from core.transcriber import WhisperTranscriber
@@ -22,6 +22,9 @@ from core.limiter import limiter
 
 router = APIRouter(tags=["transcripts"])
 
+# Inline cue markup (<i>, <b>, <c.color>, <00:01.000>) in SRT/VTT text lines
+_CUE_TAG = re.compile(r'<[^>]+>')
+
 UPLOAD_DIR = str(settings.upload_dir)
 
 # Global transcriber instance (lazy loaded)
@@ -115,9 +118,10 @@ def transcribe_media(request: Request, transcribe_data: TranscribeRequest, db: S
         request.app.state.transcription_progress[transcribe_data.videoPath] = 100
         
         # Persist to DB if projectId is provided
+        # The old segments are deleted and the new ones inserted in one short
+        # transaction, so SQLite's write lock is never held during Whisper
         if transcribe_data.projectId:
             try:
-                from db import Segment as DBSegment
                 db.query(DBSegment).filter(DBSegment.projectId == transcribe_data.projectId).delete()
                 
                 for w in result.get('words', []):
@@ -329,7 +333,8 @@ async def upload_transcript_manual(request: UploadTranscriptRequest, db: Session
             if line.isdigit():
                 continue
                 
-            line = re.sub(r'<[^>]+>', '', line)
+            if '<' in line:
+                line = _CUE_TAG.sub('', line)
             if line:
                 block_lines.append(line)
         
@@ -13,6 +13,8 @@ class AudioAnalyzer:
         self.y = None
         self.sr = None
         self.rms = None
+        self._rms_cumsum = None     # Prefix sums of rms and rms**2 for O(1) window stats
+        self._rms_sq_cumsum = None
         self.pitches = None
         self.magnitudes = None
         self.is_ready = False
@@ -56,6 +58,9 @@ class AudioAnalyzer:
 
             # Pre-calculate RMS Energy (Volume)
             self.rms = librosa.feature.rms(y=self.y)[0]
+            rms64 = self.rms.astype(np.float64)
+            self._rms_cumsum = np.concatenate(([0.0], np.cumsum(rms64)))
+            self._rms_sq_cumsum = np.concatenate(([0.0], np.cumsum(rms64 * rms64)))
 
             # Removed slow pitch calculation (piptrack) as it's not used in core heuristics.
             # self.pitches, self.magnitudes = librosa.piptrack(y=self.y, sr=self.sr)
@@ -108,3 +113,40 @@ class AudioAnalyzer:
         except Exception as e:
             logger.warning(f"Error extracting audio features for {start_time}-{end_time}: {e}")
             return {}
+
+    def get_features_batch(self, start_times, end_times) -> list:
+        """
+        Audio features for many windows at once (same values as get_features).
+        Frame bounds are computed as arrays and mean/variance come from the
+        prefix sums, so each window costs O(1) instead of a slice reduction.
+        """
+        if not self.is_ready or len(start_times) == 0:
+            return [{} for _ in start_times]
+
+        try:
+            hop_length = 512  # librosa default, as in get_features
+            n_frames = len(self.rms)
+            start_frames = (np.asarray(start_times, dtype=np.float64) * self.sr).astype(np.int64) // hop_length
+            end_frames = (np.asarray(end_times, dtype=np.float64) * self.sr).astype(np.int64) // hop_length
+
+            # Ensure indices are within bounds
+            start_frames = np.clip(start_frames, 0, n_frames - 1)
+            end_frames = np.maximum(start_frames + 1, np.minimum(end_frames, n_frames))
+
+            counts = end_frames - start_frames
+            avg_energy = (self._rms_cumsum[end_frames] - self._rms_cumsum[start_frames]) / counts
+            mean_sq = (self._rms_sq_cumsum[end_frames] - self._rms_sq_cumsum[start_frames]) / counts
+            energy_variance = np.maximum(mean_sq - avg_energy * avg_energy, 0.0)
+
+            return [
+                {
+                    'avg_energy': round(float(energy), 4),
+                    'energy_variance': round(float(variance), 4),
+                    'avg_pitch': 0.0,
+                    'pitch_stability': 0.0
+                }
+                for energy, variance in zip(avg_energy, energy_variance)
+            ]
+        except Exception as e:
+            logger.warning(f"Error extracting batched audio features: {e}")
+            return [self.get_features(s, e) for s, e in zip(start_times, end_times)]
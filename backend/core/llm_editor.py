@@ -11,6 +11,9 @@ from core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Markdown code fences the model may wrap its JSON answer in
+_CODE_FENCE = re.compile(r"```json|```")
+
 class LLMEditor:
     def __init__(self):
         self.api_key = settings.gemini_api_key
@@ -78,7 +81,7 @@ OUTPUT FORMAT:
             text_response = response.text.strip()
             # Remove markdown backticks if present
             if text_response.startswith("```"):
-                text_response = re.sub(r"```json|```", "", text_response).strip()
+                text_response = _CODE_FENCE.sub("", text_response).strip()
             
             discard_ids = json.loads(text_response)
             if isinstance(discard_ids, list):
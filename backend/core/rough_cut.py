@@ -8,16 +8,186 @@ Implements sophisticated editing rules:
 4. Incomplete Sentence Detection
 """
 
+import bisect
+import functools
+import itertools
 import logging
 import re
 import difflib
 from typing import List, Dict, Tuple, Optional
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+class _CharFilter:
+    """
+    Deletes the characters matched by a one-character regex class, i.e.
+    pattern.sub('', text). ASCII text (nearly all transcripts) goes through
+    bytes.translate with the ASCII characters the pattern matches, which is
+    several times faster than the regex engine; anything else uses the regex.
+    """
+    def __init__(self, pattern: str):
+        self.pattern = re.compile(pattern)
+        self.ascii_deletions = bytes(c for c in range(128) if self.pattern.match(chr(c)))
+
+    def delete(self, text: str) -> str:
+        if text.isascii():
+            return text.encode('ascii').translate(None, self.ascii_deletions).decode('ascii')
+        return self.pattern.sub('', text)
+
+
+# Text cleanup filters, built once (the passes below run them per segment/word)
+_PUNCTUATION = _CharFilter(r'[^\w\s]')           # Drop punctuation, keep words and spaces
+_NON_KEYWORD_CHARS = _CharFilter(r"[^\w\s']")   # As above, but keep apostrophes ("don't")
+_NON_WORD_CHARS = _CharFilter(r'[^\w]')          # Single word: keep word characters only
+_NON_TOKEN_CHARS = _CharFilter(r"[^\w']")        # Single word, keeping apostrophes
+
+def _last_sentence_end(text: str, end: Optional[int] = None) -> int:
+    """Index of the last '.', '!' or '?' in text[:end], or -1 (three C-level reverse scans)."""
+    if end is None:
+        end = len(text)
+    return max(text.rfind('.', 0, end), text.rfind('!', 0, end), text.rfind('?', 0, end))
+
+
+# Contractions expanded before comparing take prefixes ("you're" and "you are" start the same take)
+_CONTRACTIONS = {
+    "you're": "you are", "i'm": "i am", "we're": "we are", "they're": "they are",
+    "it's": "it is", "he's": "he is", "she's": "she is", "that's": "that is",
+    "what's": "what is", "don't": "do not", "doesn't": "does not", "didn't": "did not",
+    "can't": "cannot", "won't": "will not", "isn't": "is not", "aren't": "are not",
+    "wasn't": "was not", "weren't": "were not", "i've": "i have", "you've": "you have",
+    "we've": "we have", "they've": "they have", "i'll": "i will", "you'll": "you will"
+}
+# One pass over the text, longest contraction first ("she's" before "he's")
+_CONTRACTION_PATTERN = re.compile('|'.join(re.escape(k) for k in sorted(_CONTRACTIONS, key=len, reverse=True)))
+
+
+def _take_prefix(text: str) -> Tuple[str, ...]:
+    """First 4 normalized words of a segment (lowercase, contractions expanded, no punctuation)."""
+    text = _CONTRACTION_PATTERN.sub(lambda m: _CONTRACTIONS[m.group(0)], text.lower())
+    return tuple(_PUNCTUATION.delete(text).split()[:4])
+
+
+# Openings of a segment that restarts the previous, trailing-off thought
+_RESTART_PREFIXES = ('so ', 'i mean', 'what i meant', 'let me', 'actually', 'the ', 'it ')
+# A short unpunctuated fragment is also dropped before an "I ..." restart
+_FRAGMENT_RESTART_PREFIXES = _RESTART_PREFIXES + ('i ',)
+
+
+# Words a sentence cannot end on ("I went to the store and"). The trail-off
+# check after a sentence end also counts weak modifiers, verbs and prepositions;
+# the last segment of the video also trims "to"/"with".
+_TRAILING_CONNECTORS = frozenset({'and', 'but', 'so', 'or', 'then', 'because', 'the', 'a'})
+_TRAIL_OFF_WORDS = _TRAILING_CONNECTORS | {
+    'almost', 'very', 'really', 'too', 'quite',
+    'is', 'are', 'was', 'were', 'am',
+    'in', 'on', 'at', 'for', 'with', 'by', 'of',
+    'if', 'when', 'while', 'although'
+}
+_FINAL_TRAILING_CONNECTORS = _TRAILING_CONNECTORS | {'to', 'with'}
+
+
+# Editor's "cut that" / "cut this" signal, found anywhere in a segment's text
+_CUT_SIGNAL = re.compile(r'cut th(?:at|is)', re.IGNORECASE)
+
+# Keywords ignore these, including "weak" adjectives/adverbs that often end false starts
+_KEYWORD_STOPS = frozenset({
+    'the', 'a', 'an', 'is', 'are', 'was', 'were', 'to', 'of', 'in', 'on', 'at', 'for', 'with', 'as', 'by',
+    'and', 'or', 'but', 'so', 'if', 'then', 'it', 'that', 'this', 'i', 'you', 'he', 'she', 'we', 'they',
+    'almost', 'maybe', 'perhaps', 'just', 'well', 'like', 'really', 'very', 'one', 'two', 'about', 'some', 'more', 'most'
+})
+
+def _keyword_mask(keywords: set) -> int:
+    """256-bit Bloom-style signature of a keyword set: one hashed bit per keyword."""
+    mask = 0
+    for w in keywords:
+        mask |= 1 << (hash(w) & 255)
+    return mask
+
+
+def _keyword_similarity_bound(mask1: int, n1: int, mask2: int, n2: int) -> float:
+    """
+    Upper bound on the Jaccard similarity of two keyword sets of sizes n1/n2,
+    from their _keyword_mask signatures. Hash collisions can only hide keywords
+    from the union's popcount, so |A & B| <= n1 + n2 - popcount(mask1 | mask2);
+    without collisions the bound is exact.
+    """
+    if not n1 or not n2:
+        return 0.0
+    inter = min(n1 + n2 - (mask1 | mask2).bit_count(), n1, n2)
+    return inter / (n1 + n2 - inter)
+
+
+@functools.lru_cache(maxsize=8192)
+def _text_tokens(text: str) -> Tuple[Tuple[str, ...], frozenset]:
+    """
+    Cleaned lowercase words of a text and its keywords. Cached by text: retakes
+    and boilerplate repeat lines, and the takes pass scores the same texts again.
+    """
+    words = tuple(_NON_KEYWORD_CHARS.delete(text.lower()).split())
+    return words, frozenset(w for w in words if len(w) > 2 and w not in _KEYWORD_STOPS)
+
+
+def _keyword_size_bound(k1: frozenset, k2: frozenset) -> float:
+    """Upper bound on _keyword_jaccard from the set sizes alone: min / max."""
+    if not k1 or not k2:
+        return 0.0
+    return min(len(k1), len(k2)) / max(len(k1), len(k2))
+
+
+def _keyword_jaccard(k1: frozenset, k2: frozenset) -> float:
+    """Jaccard similarity of two keyword sets (0.0 if either is empty)."""
+    if not k1 or not k2:
+        return 0.0
+    inter = len(k1 & k2)
+    return inter / (len(k1) + len(k2) - inter)  # |A | B| without building the union
+
+
+def _word_matcher(words1: Tuple[str, ...], words2: Tuple[str, ...]) -> difflib.SequenceMatcher:
+    """
+    SequenceMatcher over two word sequences. Words give ~5x shorter sequences
+    than characters, and autojunk is off: on 200+ items it would treat common
+    words ("i", "the") as junk and understate the match.
+    """
+    return difflib.SequenceMatcher(None, words1, words2, autojunk=False)
+
+
+@functools.lru_cache(maxsize=8192)
+def _token_similarity(tokens1: Tuple[Tuple[str, ...], frozenset], tokens2: Tuple[Tuple[str, ...], frozenset],
+                      keyword_floor: float) -> float:
+    """
+    Similarity of two _text_tokens results. Cached per ordered pair, since
+    SequenceMatcher.ratio() dominates and pairs are scored more than once.
+    """
+    return _score_tokens(tokens1, tokens2, keyword_floor, _word_matcher(tokens1[0], tokens2[0]))
+
+
+def _score_tokens(tokens1: Tuple[Tuple[str, ...], frozenset], tokens2: Tuple[Tuple[str, ...], frozenset],
+                  keyword_floor: float, matcher: difflib.SequenceMatcher) -> float:
+    """_token_similarity with a matcher already set to (tokens1 words, tokens2 words)."""
+    words1, k1 = tokens1
+    words2, k2 = tokens2
+    
+    # 1. Structural Similarity (difflib, word by word; identical takes need no matching)
+    struct_score = 1.0 if words1 == words2 else matcher.ratio()
+    
+    # 2. Semantic Keyword Similarity (Bag of Words)
+    # This catches "I want to go" vs "I need to leave" (different structure, similar keywords)
+    sem_score = _keyword_jaccard(k1, k2) if _keyword_size_bound(k1, k2) >= keyword_floor else 0.0
+        
+    # Return weighted score
+    # SAFETY FIRST: We want high structural AND high semantic similarity to cut.
+    # If they are structurally similar but have different keywords, they are likely different.
+    if sem_score < keyword_floor: # Increased threshold for safety
+        return struct_score * 0.4 # More aggressive penalty
+        
+    return max(struct_score, sem_score)
+
 
 class ProfessionalRoughCutV2:
-    def __init__(self, words: List[Dict], ml_cut_threshold: float = 0.8, video_path: Optional[str] = None):
+    def __init__(self, words: List[Dict], ml_cut_threshold: float = 0.8, video_path: Optional[str] = None,
+                 starts: Optional[np.ndarray] = None, ends: Optional[np.ndarray] = None):
         """
         Initialize with word-level transcript.
         Words expected format: [{'word': str, 'start': float, 'end': float}, ...]
@@ -30,15 +200,40 @@ class ProfessionalRoughCutV2:
                              0.6 = Moderate
                              0.4 = Aggressive (more ML cuts)
             video_path: Optional path to video for multi-modal analysis
+            starts, ends: Optional pre-built float64 arrays of word start/end times
+                          (parallel to words), skipping the per-word rebuild here
         """
         self.words = words
+        
+        # Structure-of-arrays view of word timings for the numeric passes
+        if starts is None or ends is None:
+            starts = np.fromiter((w['start'] for w in words), dtype=np.float64, count=len(words))
+            ends = np.fromiter((w['end'] for w in words), dtype=np.float64, count=len(words))
+        self._starts = starts
+        self._ends = ends
+        # The same timings as plain floats, for per-word lookups that end up in segment dicts
+        self._start_times = starts.tolist()
+        self._end_times = ends.tolist()
+        # Word text column, so segment text is rebuilt without a dict lookup per word
+        self._word_texts = [w['word'] for w in words]
+        # Editor 'isDeleted' flags as one byte per word, read by several passes
+        self._deleted = bytearray(1 if w.get('isDeleted', False) else 0 for w in words)
+        # Words that close a sentence (., !, ?), checked once instead of per pass
+        self._ends_sentence = np.fromiter(
+            (text.strip().endswith(('.', '!', '?')) for text in self._word_texts),
+            dtype=bool, count=len(words)
+        )
         self.video_path = video_path
         self.segments = []
+        # Padded timeline extents of self.segments, for get_statistics
+        self._seg_starts = np.empty(0, dtype=np.float64)
+        self._seg_ends = np.empty(0, dtype=np.float64)
         
         # Thresholds
         self.SILENCE_THRESHOLD = 2.0  # User Request: Remove silence > 2.0s
         self.SENTENCE_SPLIT_GAP = 0.4
         self.REPETITION_SIMILARITY = 0.92 # SAFETY FIRST: Increased from 0.85
+        self.KEYWORD_SIMILARITY_FLOOR = 0.7  # Below this keyword overlap, similarity is heavily penalized
         self.MIN_SEGMENT_LENGTH = 3
         self.ML_CUT_THRESHOLD = ml_cut_threshold  # Configurable ML threshold
         
@@ -148,13 +343,13 @@ class ProfessionalRoughCutV2:
         
         # Step 6.5: ML Overrides (Personalization Layer)
         # If the model has learned that specific patterns should be CUT, it overrides heuristics.
-        if self.use_ml:
-            segments = self._apply_ml_overrides(segments)
-            logger.info(f"{len(segments)} segments after ML overrides")
-        
         # Step 7: ML Logging (Record decisions for future training)
+        # The overrides hand back the audio features of the segments they kept,
+        # so the log reuses them instead of reading the same windows again.
         if self.use_ml:
-            self._log_decisions(segments)
+            segments, audio_feats = self._apply_ml_overrides(segments)
+            logger.info(f"{len(segments)} segments after ML overrides")
+            self._log_decisions(segments, audio_feats)
         
         # Final Step: Convert to timeline segments
         self.segments = self._finalize_segments(segments)
@@ -174,46 +369,25 @@ class ProfessionalRoughCutV2:
         if not segments:
             return []
             
-        scrubbed_indices = set()
+        # Both checks look at segment i (and its successor) only, so they run
+        # in a single pass
+        final_segments = []
+        last = len(segments) - 1
+        # Clean text for comparison (each text is compared as curr and as next)
+        clean_texts = [_PUNCTUATION.delete(seg['text'].lower()).strip() for seg in segments]
         
-        # Pass 1: Subset Matching
-        for i in range(len(segments) - 1):
-            if i in scrubbed_indices: continue
-            
-            curr = segments[i]
-            next_seg = segments[i+1]
-            
-            # Clean text for comparison
-            curr_text = re.sub(r'[^\w\s]', '', curr['text'].lower()).strip()
-            next_text = re.sub(r'[^\w\s]', '', next_seg['text'].lower()).strip()
-            
-            if not curr_text or not next_text: continue
-            
-            # Rule 1: Direct Subset
-            # "so right now" (curr) vs "so right now we are seeing" (next)
-            is_subset = curr_text in next_text and len(curr_text) < len(next_text)
-            
-            # Rule 2: Fuzzy Match (>85%)
-            # "so right now we are" vs "so right now we are seeing"
-            matcher = difflib.SequenceMatcher(None, curr_text, next_text)
-            is_fuzzy = matcher.ratio() > 0.85 and len(curr_text) < len(next_text)
-            
-            if is_subset or is_fuzzy:
-                scrubbed_indices.add(i)
+        for i, seg in enumerate(segments):
+            # Pass 1: Subset Matching
+            if i < last and self._is_subset_text(clean_texts[i], clean_texts[i+1]):
                 self.stats['repetitions_removed'] += 1
-                logger.info(f"Textual Scrub: REMOVED '{curr['text']}' (subset of '{next_seg['text']}')")
+                logger.info(f"Textual Scrub: REMOVED '{seg['text']}' (subset of '{segments[i+1]['text']}')")
                 continue
 
-        # Pass 2: Duration-to-Text Ratio
-        # TODO: Refine thresholds based on user feedback. 
-        # Current: Just logging for analysis, not deleting yet unless obviously bad.
-        # User Request: "Flag segments... for deletion"
-        # We will be conservative to avoid over-cutting.
-        
-        final_segments = []
-        for i, seg in enumerate(segments):
-            if i in scrubbed_indices: continue
-            
+            # Pass 2: Duration-to-Text Ratio
+            # TODO: Refine thresholds based on user feedback. 
+            # Current: Just logging for analysis, not deleting yet unless obviously bad.
+            # User Request: "Flag segments... for deletion"
+            # We will be conservative to avoid over-cutting.
             duration = seg['end_time'] - seg['start_time']
             word_count = len(seg['word_indices'])
             
@@ -231,6 +405,23 @@ class ProfessionalRoughCutV2:
             
         return final_segments
 
+    def _is_subset_text(self, curr_text: str, next_text: str) -> bool:
+        """Textual scrub rule: curr_text is a (fuzzy) shorter version of next_text (both cleaned)."""
+        # Both rules need curr to be the shorter text
+        if not curr_text or not next_text or len(curr_text) >= len(next_text):
+            return False
+        
+        # Rule 1: Direct Subset
+        # "so right now" (curr) vs "so right now we are seeing" (next)
+        if curr_text in next_text:
+            return True
+        
+        # Rule 2: Fuzzy Match (>85%)
+        # "so right now we are" vs "so right now we are seeing"
+        # (cheap upper bounds first, as difflib.get_close_matches does)
+        matcher = difflib.SequenceMatcher(None, curr_text, next_text)
+        return matcher.real_quick_ratio() > 0.85 and matcher.quick_ratio() > 0.85 and matcher.ratio() > 0.85
+
     def _split_by_silence(self) -> List[Dict]:
         """
         Split transcript into segments by removing silences > 1 second.
@@ -240,71 +431,66 @@ class ProfessionalRoughCutV2:
             return []
         
         segments = []
-        current_segment_words = []
         current_start_idx = 0
+        last_idx = len(self.words) - 1
         
-        for i in range(len(self.words)):
-            # Special check: skip words already marked as deleted by expert editor
-            if self.words[i].get('isDeleted', False):
-                # If we were building a segment, and hit a deleted word, 
-                # we don't necessarily end the segment, but we don't add this word.
-                # However, for simplicity in rough cut segments, we'll exclude deleted words later.
-                pass
-            
-            current_segment_words.append(i)
+        # Gap from each word to the next; only gaps over the threshold can end a segment
+        gaps = self._starts[1:] - self._ends[:-1]
+        long_gaps = np.flatnonzero(gaps > self.SILENCE_THRESHOLD)
+        
+        gap_starts = self._ends[long_gaps].tolist()
+        
+        # Energy inside every long gap, batched up front for the smart-silence check
+        gap_energies = None
+        if self.audio_analyzer:
+            gap_energies = [feats.get('avg_energy', 0) for feats in self.audio_analyzer.get_features_batch(
+                gap_starts, self._starts[long_gaps + 1].tolist()
+            )]
+        
+        for k, (i, gap) in enumerate(zip(long_gaps.tolist(), gaps[long_gaps].tolist())):
+            # --- SMART SILENCE RECOVERY (New) ---
+            is_true_silence = True
+            if gap_energies is not None:
+                if gap_energies[k] > 0.08: # Significant sound (laughter, etc)
+                    is_true_silence = False
+                    logger.info(f"Smart Silence: Preserving {gap:.1f}s gap at {gap_starts[k]:.1f}s due to detected energy ({gap_energies[k]:.3f})")
             
-            # Check gap to next word
-            if i < len(self.words) - 1:
-                gap = self.words[i + 1]['start'] - self.words[i]['end']
+            if is_true_silence:
+                self.stats['silences_removed'] += 1
+                self.stats['silence_duration_removed'] += gap
                 
-                # If gap exceeds threshold, end current segment
-                if gap > self.SILENCE_THRESHOLD:
-                    # --- SMART SILENCE RECOVERY (New) ---
-                    is_true_silence = True
-                    if self.audio_analyzer:
-                        gap_start = self.words[i]['end']
-                        gap_end = self.words[i+1]['start']
-                        audio_feats = self.audio_analyzer.get_features(gap_start, gap_end)
-                        if audio_feats.get('avg_energy', 0) > 0.08: # Significant sound (laughter, etc)
-                            is_true_silence = False
-                            logger.info(f"Smart Silence: Preserving {gap:.1f}s gap at {gap_start:.1f}s due to detected energy ({audio_feats.get('avg_energy'):.3f})")
-                    
-                    if is_true_silence:
-                        self.stats['silences_removed'] += 1
-                        self.stats['silence_duration_removed'] += gap
-                        
-                        # Save current segment
-                        if current_segment_words:
-                            segments.append({
-                                'word_indices': current_segment_words.copy(),
-                                'start_idx': current_start_idx,
-                                'end_idx': i,
-                                'start_time': self.words[current_start_idx]['start'],
-                                'end_time': self.words[i]['end'],
-                                'text': ' '.join([self.words[idx]['word'] for idx in current_segment_words if not self.words[idx].get('isDeleted', False)])
-                            })
-                        
-                        # Start new segment
-                        current_segment_words = []
-                        current_start_idx = i + 1
-                        logger.debug(f"Removed {gap:.1f}s silence at {self.words[i]['end']:.1f}s")
-                    else:
-                        # Not a true silence, keep building the current segment
-                        pass
+                # Save current segment and start a new one after the gap
+                segments.append(self._make_silence_segment(current_start_idx, i))
+                current_start_idx = i + 1
+                logger.debug(f"Removed {gap:.1f}s silence at {gap_starts[k]:.1f}s")
         
         # Add final segment
-        if current_segment_words:
-            segments.append({
-                'word_indices': current_segment_words,
-                'start_idx': current_start_idx,
-                'end_idx': len(self.words) - 1,
-                'start_time': self.words[current_start_idx]['start'],
-                'end_time': self.words[-1]['end'],
-                'text': ' '.join([self.words[idx]['word'] for idx in current_segment_words if not self.words[idx].get('isDeleted', False)])
-            })
+        segments.append(self._make_silence_segment(current_start_idx, last_idx))
         
         return segments
 
+    def _make_silence_segment(self, start_idx: int, end_idx: int) -> Dict:
+        """
+        Segment spanning words start_idx..end_idx (inclusive). Words deleted by the
+        expert editor stay in word_indices (later passes exclude them) but are
+        left out of the text.
+        """
+        texts = self._word_texts[start_idx:end_idx + 1]
+        deleted = self._deleted[start_idx:end_idx + 1]
+        return {
+            'word_indices': list(range(start_idx, end_idx + 1)),
+            'start_idx': start_idx,
+            'end_idx': end_idx,
+            'start_time': self._start_times[start_idx],
+            'end_time': self._end_times[end_idx],
+            'text': ' '.join([text for text, is_deleted in zip(texts, deleted) if not is_deleted])
+        }
+    
+    def _join_words(self, indices: List[int]) -> str:
+        """Segment text for the given word indices."""
+        texts = self._word_texts
+        return ' '.join([texts[idx] for idx in indices])
+
     def _refine_segmentation(self, segments: List[Dict]) -> List[Dict]:
         """
         Sub-split segments based on:
@@ -312,46 +498,69 @@ class ProfessionalRoughCutV2:
         2. Media-gap (> 0.4s) - Catch retakes that are separated by small breaths.
         """
         refined = []
+        if not segments:
+            return refined
         
-        for segment in segments:
-            words_in_seg = [self.words[idx] for idx in segment['word_indices']]
-            sub_splits = [0]
-            
-            for i in range(len(words_in_seg) - 1):
-                w1 = words_in_seg[i]
-                w2 = words_in_seg[i+1]
-                
-                # Split on punctuation
-                if w1['word'].strip().endswith(('.', '!', '?')):
-                    sub_splits.append(i + 1)
-                # Split on gap (> 0.4s)
-                elif w2['start'] - w1['end'] > self.SENTENCE_SPLIT_GAP:
-                    # --- AUDIO VALIDATION (New) ---
-                    is_true_split = True
-                    if self.audio_analyzer:
-                        gap_start = w1['end']
-                        gap_end = w2['start']
-                        audio_feats = self.audio_analyzer.get_features(gap_start, gap_end)
-                        if audio_feats.get('avg_energy', 0) > 0.1: # Significant sound (laughter, etc)
-                             is_true_split = False
-                             logger.info(f"Refine: Preserving {w2['start']-w1['end']:.1f}s gap at {gap_start:.1f}s due to energy ({audio_feats.get('avg_energy'):.3f})")
-                    
-                    if is_true_split:
-                        sub_splits.append(i + 1)
+        # All segments' word indices end to end; position p is the pair (flat[p], flat[p + 1])
+        offsets = np.cumsum([0] + [len(seg['word_indices']) for seg in segments])
+        flat = np.fromiter(itertools.chain.from_iterable(seg['word_indices'] for seg in segments),
+                           dtype=np.int64, count=int(offsets[-1]))
+        left, right = flat[:-1], flat[1:]
+        
+        # Split on punctuation, or on gap (> 0.4s), for every pair in one pass
+        ends_sentence = self._ends_sentence[left]
+        split = ends_sentence | ((self._starts[right] - self._ends[left]) > self.SENTENCE_SPLIT_GAP)
+        # The last word of a segment and the first of the next are not a pair
+        boundaries = offsets[1:-1]
+        split[boundaries[(boundaries > 0) & (boundaries < len(flat))] - 1] = False
+        
+        # --- AUDIO VALIDATION (New) ---
+        # Gap-only splits are dropped when the gap holds sound (laughter, etc)
+        if self.audio_analyzer:
+            gap_only = np.flatnonzero(split & ~ends_sentence)
+            if len(gap_only):
+                gap_starts = self._ends[left[gap_only]].tolist()
+                gap_ends = self._starts[right[gap_only]].tolist()
+                feats = self.audio_analyzer.get_features_batch(gap_starts, gap_ends)
+                for p, gap_start, gap_end, audio_feats in zip(gap_only.tolist(), gap_starts, gap_ends, feats):
+                    if audio_feats.get('avg_energy', 0) > 0.1: # Significant sound (laughter, etc)
+                         split[p] = False
+                         logger.info(f"Refine: Preserving {gap_end-gap_start:.1f}s gap at {gap_start:.1f}s due to energy ({audio_feats.get('avg_energy'):.3f})")
+        
+        split_positions = np.flatnonzero(split).tolist()
+        # Range of split_positions falling in each segment
+        bounds = np.searchsorted(split_positions, offsets).tolist()
+        offsets = offsets.tolist()
+        # Segment text leaves out deleted words while _join_words keeps them, so
+        # an unsplit segment's list and text are only reusable if nothing is deleted
+        any_deleted = 1 in self._deleted
+        
+        for k, segment in enumerate(segments):
+            seg_indices = segment['word_indices']
+            if bounds[k] == bounds[k + 1] and seg_indices and not any_deleted:
+                refined.append({
+                    'word_indices': seg_indices,
+                    'start_time': self._start_times[seg_indices[0]],
+                    'end_time': self._end_times[seg_indices[-1]],
+                    'text': segment['text']
+                })
+                continue
             
-            sub_splits.append(len(words_in_seg))
+            base = offsets[k]
+            sub_splits = [0] + [p + 1 - base for p in split_positions[bounds[k]:bounds[k + 1]]]
+            sub_splits.append(len(seg_indices))
             
             # Create sub-segments
             for s in range(len(sub_splits) - 1):
                 start = sub_splits[s]
                 end = sub_splits[s+1]
                 if end > start:
-                    indices = segment['word_indices'][start:end]
+                    indices = seg_indices[start:end]
                     refined.append({
                         'word_indices': indices,
-                        'start_time': self.words[indices[0]]['start'],
-                        'end_time': self.words[indices[-1]]['end'],
-                        'text': ' '.join([self.words[idx]['word'] for idx in indices])
+                        'start_time': self._start_times[indices[0]],
+                        'end_time': self._end_times[indices[-1]],
+                        'text': self._join_words(indices)
                     })
         
         return refined
@@ -365,20 +574,20 @@ class ProfessionalRoughCutV2:
         - Remove everything from that point through "cut that"
         - Keep what follows
         """
+        # Most transcripts have no signal at all: rule that out with one plain scan
+        # of the whole text. Any segment match also matches here ("cut th" has no
+        # special case-insensitive forms), so nothing is missed.
+        if 'cut th' not in ' '.join([segment['text'] for segment in segments]).lower():
+            return segments
+        
         processed = []
         
         for segment in segments:
-            text = segment['text'].lower()
-            
-            # Check for "cut that" signal
-            if 'cut that' in text or 'cut this' in text:
+            # Check for "cut that" signal (one case-insensitive scan of the text)
+            if _CUT_SIGNAL.search(segment['text']):
                 self.stats['cut_that_signals'] += 1
                 logger.info(f"Found 'cut that' signal at {segment['start_time']:.1f}s")
                 
-                # Find position of "cut that"
-                cut_phrase = 'cut that' if 'cut that' in text else 'cut this'
-                cut_position = text.find(cut_phrase)
-                
                 # Split text into: before_cut | cut_that | after_cut
                 words_list = segment['text'].split()
                 before_words = []
@@ -391,13 +600,13 @@ class ProfessionalRoughCutV2:
                         skip_next = False
                         continue
                         
-                    cur_clean = re.sub(r'[^\w]', '', word.lower())
+                    cur_clean = _NON_WORD_CHARS.delete(word.lower())
                     
                     if cur_clean in ['cut'] and not in_after:
                         # Check if this is part of "cut that"
                         if i < len(words_list) - 1:
                             next_word = words_list[i+1]
-                            next_clean = re.sub(r'[^\w]', '', next_word.lower())
+                            next_clean = _NON_WORD_CHARS.delete(next_word.lower())
                             if next_clean in ['that', 'this']:
                                 in_after = True
                                 skip_next = True # Skip the "that/this" word
@@ -415,15 +624,11 @@ class ProfessionalRoughCutV2:
                 # If before_text ends with punctuation, that's likely the "bad" sentence's end.
                 # So we search in the text *excluding* the trailing punctuation to find the *previous* one.
                 
-                search_text = before_text
-                if search_text and search_text[-1] in '.!?':
-                    search_text = search_text[:-1]
+                search_end = len(before_text)
+                if before_text and before_text[-1] in '.!?':
+                    search_end -= 1
                     
-                last_sentence_end = max(
-                    search_text.rfind('.'),
-                    search_text.rfind('!'),
-                    search_text.rfind('?')
-                )
+                last_sentence_end = _last_sentence_end(before_text, search_end)
                 
                 if last_sentence_end > 0:
                     # Keep up to last complete sentence
@@ -463,8 +668,8 @@ class ProfessionalRoughCutV2:
                     segment['text'] = new_text
                     # Update timings based on new indices
                     if new_indices:
-                        segment['start_time'] = self.words[new_indices[0]]['start']
-                        segment['end_time'] = self.words[new_indices[-1]]['end']
+                        segment['start_time'] = self._start_times[new_indices[0]]
+                        segment['end_time'] = self._end_times[new_indices[-1]]
 
                     processed.append(segment)
                     logger.info(f"After 'cut that' processing: \"{new_text[:50]}...\"")
@@ -484,11 +689,18 @@ class ProfessionalRoughCutV2:
         
         for i, segment in enumerate(segments):
             text = segment['text'].strip()
+            # Most segments end on their sentence mark (refinement splits there),
+            # so nothing trails it and the reverse scans can be skipped
+            if text.endswith(('.', '!', '?')):
+                if segment['word_indices']:
+                    cleaned.append(segment)
+                continue
+
             # Find the index of the last punctuation mark
             # (., !, ?)
-            matches = list(re.finditer(r'[.!?]', text))
+            last_punct_idx = _last_sentence_end(text)
             
-            if not matches:
+            if last_punct_idx < 0:
                 # No punctuation at all. 
                 
                 # 1. Check for trailing connectors (User Rule: Incomplete Sentences)
@@ -496,33 +708,28 @@ class ProfessionalRoughCutV2:
                 words_text = segment['text'].split()
                 if words_text:
                     last_word = words_text[-1].lower()
-                    trailing_connectors = ['and', 'but', 'so', 'or', 'then', 'because', 'the', 'a']
                     
-                    if last_word in trailing_connectors:
+                    if last_word in _TRAILING_CONNECTORS:
                         # Trim the connector
                         # "I went to the store and" -> "I went to the store"
                         word_indices = word_indices[:-1]
                         segment['word_indices'] = word_indices
                         segment['text'] = ' '.join(words_text[:-1])
                         if word_indices:
-                            segment['end_time'] = self.words[word_indices[-1]]['end']
+                            segment['end_time'] = self._end_times[word_indices[-1]]
                         logger.info(f"Trimmed trailing connector '{last_word}' from unpunctuated segment")
 
                 # 2. If it's short, unpunctuated, and followed by a restart, kill it.
                 # But be careful: "I think so" is valid.
                 if len(segment['word_indices']) < 6 and i < len(segments) - 1:
                     next_text = segments[i + 1]['text'].lower()
-                    restarts = ['so ', 'i mean', 'what i meant', 'let me', 'actually', 'the ', 'it ', 'i ']
-                    if any(next_text.startswith(r) for r in restarts):
+                    if next_text.startswith(_FRAGMENT_RESTART_PREFIXES):
                         continue
                 
                 if segment['word_indices']:
                     cleaned.append(segment)
                 continue
             
-            last_match = matches[-1]
-            last_punct_idx = last_match.start()
-            
             # Text after last punctuation
             trailing_text = text[last_punct_idx+1:].strip()
             trailing_words = trailing_text.split()
@@ -532,23 +739,15 @@ class ProfessionalRoughCutV2:
                 should_trim = False
                 if i < len(segments) - 1:
                     next_text = segments[i + 1]['text'].lower()
-                    restarts = ['so ', 'i mean', 'what i meant', 'let me', 'actually', 'the ', 'it ']
                     
                     # Condition 1: Next segment starts with a restart
-                    if any(next_text.startswith(r) for r in restarts):
+                    if next_text.startswith(_RESTART_PREFIXES):
                         should_trim = True
                     
                     # Condition 2: Current segment trails off with a connector (User Rule: Incomplete Sentences)
                     # "I went to the store and..." [Pause causing split] -> Trim "and"
-                    trailing_connectors = [
-                        'and', 'but', 'so', 'or', 'then', 'because', 'the', 'a',
-                        'almost', 'very', 'really', 'too', 'quite',
-                        'is', 'are', 'was', 'were', 'am',
-                        'in', 'on', 'at', 'for', 'with', 'by', 'of',
-                        'if', 'when', 'while', 'because', 'although'
-                    ]
                     last_word = trailing_words[-1].lower() if trailing_words else ""
-                    if last_word in trailing_connectors:
+                    if last_word in _TRAIL_OFF_WORDS:
                         should_trim = True
                         logger.info(f"Detected trail-off ending with '{last_word}'")
                 
@@ -556,20 +755,19 @@ class ProfessionalRoughCutV2:
                     # SURGICAL CUT: Keep only up to the punctuation
                     num_words_to_keep = len(text[:last_punct_idx+1].split())
                     segment['word_indices'] = segment['word_indices'][:num_words_to_keep]
-                    segment['text'] = ' '.join([self.words[idx]['word'] for idx in segment['word_indices']])
+                    segment['text'] = self._join_words(segment['word_indices'])
                     if segment['word_indices']:
-                        segment['end_time'] = self.words[segment['word_indices'][-1]]['end']
+                        segment['end_time'] = self._end_times[segment['word_indices'][-1]]
                     self.stats['incomplete_sentences'] += 1
                     logger.info(f"Surgical Cut: Trimmed dangling thought: \"...{trailing_text}\"")
                 elif i == len(segments) - 1 and trailing_words:
                     # Special Rule for last segment: If it ends with a connector, trim it too
-                    trailing_connectors = ['and', 'but', 'so', 'or', 'then', 'because', 'the', 'a', 'to', 'with']
-                    if trailing_words[-1].lower() in trailing_connectors:
+                    if trailing_words[-1].lower() in _FINAL_TRAILING_CONNECTORS:
                          num_words_to_keep = len(text[:last_punct_idx+1].split())
                          segment['word_indices'] = segment['word_indices'][:num_words_to_keep]
-                         segment['text'] = ' '.join([self.words[idx]['word'] for idx in segment['word_indices']])
+                         segment['text'] = self._join_words(segment['word_indices'])
                          if segment['word_indices']:
-                             segment['end_time'] = self.words[segment['word_indices'][-1]]['end']
+                             segment['end_time'] = self._end_times[segment['word_indices'][-1]]
                          logger.info(f"Final surgical trim on connector: '{trailing_words[-1]}'")
             
             if segment['word_indices']:
@@ -594,6 +792,8 @@ class ProfessionalRoughCutV2:
             
         processed = []
         indices_to_discard = set()
+        # Each segment is an anchor once and a candidate for up to 9 anchors
+        prefixes = [_take_prefix(seg['text']) for seg in segments]
         
         i = 0
         while i < len(segments):
@@ -603,25 +803,10 @@ class ProfessionalRoughCutV2:
                 
             curr = segments[i]
             
-            # Normalize prefix
-            def get_prefix(t):
-                # Contraction normalization
-                t = t.lower()
-                replacements = {
-                    "you're": "you are", "i'm": "i am", "we're": "we are", "they're": "they are",
-                    "it's": "it is", "he's": "he is", "she's": "she is", "that's": "that is",
-                    "what's": "what is", "don't": "do not", "doesn't": "does not", "didn't": "did not",
-                    "can't": "cannot", "won't": "will not", "isn't": "is not", "aren't": "are not",
-                    "wasn't": "was not", "weren't": "were not", "i've": "i have", "you've": "you have",
-                    "we've": "we have", "they've": "they have", "i'll": "i will", "you'll": "you will"
-                }
-                for k, v in replacements.items():
-                    t = t.replace(k, v)
-                    
-                return re.sub(r'[^\w\s]', '', t).split()[:4]
-            
-            anchor_prefix = get_prefix(curr['text'])
-            if not anchor_prefix:
+            anchor_prefix = prefixes[i]
+            # A cluster needs a shared prefix of at least 3 words (see below), so
+            # shorter anchors cannot match anything and are not compared
+            if len(anchor_prefix) < 3:
                 i += 1
                 continue
             
@@ -637,17 +822,12 @@ class ProfessionalRoughCutV2:
                 if later['start_time'] - curr['end_time'] > 30:
                     break
                     
-                later_prefix = get_prefix(later['text'])
+                later_prefix = prefixes[j]
                 
                 # Check for prefix match
-                match_count = 0
-                for w1, w2 in zip(anchor_prefix, later_prefix):
-                    if w1 == w2: match_count += 1
-                    else: break
-                
                 # STRICTER: Must match the full extracted prefix (up to 4 words)
                 # This prevents "I really like apples" and "I really like oranges" from clustering
-                if match_count == len(anchor_prefix) and match_count >= 3:
+                if later_prefix[:len(anchor_prefix)] == anchor_prefix:
                      cluster.append(j)
             
             if len(cluster) > 1:
@@ -664,32 +844,36 @@ class ProfessionalRoughCutV2:
                 # We'll mark indices to discard within this cluster
                 cluster_discard = set()
                 
-                # Sort by index (chronological) to compare
-                sorted_cluster = sorted(cluster)
+                # The cluster is built in index (chronological) order already.
+                # Every member is compared with every other, in both roles, so
+                # per-segment inputs are prepared once
+                clean_texts = {idx: _PUNCTUATION.delete(segments[idx]['text'].lower()) for idx in cluster}
+                keywords = {idx: self._get_keywords(segments[idx]['text']) for idx in cluster}
+                punctuated = {idx: segments[idx]['text'].strip().endswith(('.', '!', '?')) for idx in cluster}
                 
-                for idx_a in sorted_cluster:
+                for idx_a in cluster:
                     if idx_a in cluster_discard: continue
                     
                     seg_a = segments[idx_a]
-                    text_a = re.sub(r'[^\w\s]', '', seg_a['text'].lower())
+                    text_a = clean_texts[idx_a]
                     
-                    for idx_b in sorted_cluster:
+                    for idx_b in cluster:
                         if idx_a == idx_b: continue
                         if idx_b in cluster_discard: continue
                         
                         seg_b = segments[idx_b]
-                        text_b = re.sub(r'[^\w\s]', '', seg_b['text'].lower())
+                        text_b = clean_texts[idx_b]
                         
                         # CHECK: Does A supersede B? (Should B be deleted?)
                         should_delete_b = False
                         
                         # Rule 1: Substring (B is inside A)
-                        if text_b in text_a and len(text_b) < len(text_a):
+                        if len(text_b) < len(text_a) and text_b in text_a:
                             should_delete_b = True
                             logger.info(f"Consolidate: '{seg_b['text'][:20]}...' is substring of '{seg_a['text'][:20]}...' -> Delete B")
                             
                         # Rule 2: High Similarity (Duplicate takes)
-                        elif self._calculate_similarity(seg_a['text'], seg_b['text']) > 0.85:
+                        elif self._similarity_exceeds(seg_a['text'], seg_b['text'], 0.85):
                             # If very similar, keep the later/longer one.
                             # Since we are iterating all pairs, we just need to decide if we kill B here.
                             # We prefer Later or Longer.
@@ -698,7 +882,7 @@ class ProfessionalRoughCutV2:
                             
                             # --- AUDIO PREFERENCE (New) ---
                             # If they are very similar, use energy as a tie-breaker before length
-                            if self.audio_analyzer and self._calculate_similarity(seg_a['text'], seg_b['text']) > 0.9:
+                            if self.audio_analyzer and self._similarity_exceeds(seg_a['text'], seg_b['text'], 0.9):
                                 energy_a = self.audio_analyzer.get_features(seg_a['start_time'], seg_a['end_time']).get('avg_energy', 0)
                                 energy_b = self.audio_analyzer.get_features(seg_b['start_time'], seg_b['end_time']).get('avg_energy', 0)
                                 if energy_a > energy_b * 1.3:
@@ -713,7 +897,7 @@ class ProfessionalRoughCutV2:
                         # We already know they share the 4-word prefix.
                         # Check if B is short and unpunctuated, while A is long and punctated.
                         elif len(seg_b['word_indices']) < len(seg_a['word_indices']) and \
-                             not seg_b['text'].strip().endswith(('.', '!', '?')) and \
+                             not punctuated[idx_b] and \
                              text_a.startswith(text_b):
                                 should_delete_b = True
                                 logger.info(f"Consolidate: '{seg_b['text'][:20]}...' is prefix of '{seg_a['text'][:20]}...' -> Delete B")
@@ -722,8 +906,8 @@ class ProfessionalRoughCutV2:
                         # If they share a prefix but diverge with unique meaningful content at the end, KEEP BOTH.
                         if not should_delete_b:
                             # Extract words after the common prefix
-                            keywords_a = self._get_keywords(seg_a['text'])
-                            keywords_b = self._get_keywords(seg_b['text'])
+                            keywords_a = keywords[idx_a]
+                            keywords_b = keywords[idx_b]
                             
                             # Unique keywords (in one but not the other)
                             unique_a = keywords_a - keywords_b
@@ -732,8 +916,6 @@ class ProfessionalRoughCutV2:
                             # SAFETY FIRST: We protect if there is a significant divergence in content.
                             # Just one unique keyword (e.g. "milk" vs "bread") is enough IF it's a strong word.
                             # If it's a weak word like "almost", it's likely a false start.
-                            has_strong_a = any(len(w) > 4 for w in unique_a) or unique_a
-                            has_strong_b = any(len(w) > 4 for w in unique_b) or unique_b
                             
                             # If both have unique content, keep both. 
                             # BUT if one is just a stuttered prefix of the other (identical keywords), delete it.
@@ -753,9 +935,9 @@ class ProfessionalRoughCutV2:
                         elif not should_delete_b:
                             # Rule 4: Quality Preference
                             # If neither supersedes, but they are very similar, pick the one with better punctuation
-                            if self._calculate_similarity(seg_a['text'], seg_b['text']) > 0.7:
-                                ends_a = seg_a['text'].strip().endswith(('.', '!', '?'))
-                                ends_b = seg_b['text'].strip().endswith(('.', '!', '?'))
+                            if self._similarity_exceeds(seg_a['text'], seg_b['text'], 0.7):
+                                ends_a = punctuated[idx_a]
+                                ends_b = punctuated[idx_b]
                                 if ends_a and not ends_b:
                                     cluster_discard.add(idx_b)
                                     indices_to_discard.add(idx_b)
@@ -790,8 +972,16 @@ class ProfessionalRoughCutV2:
         
         kept = []
         removed_indices = set()
+        # Each segment is compared against up to 9 neighbours; clean its text once
+        tokens = [self._similarity_tokens(seg['text']) for seg in segments]
+        masks = [_keyword_mask(keywords) for _, keywords in tokens]
+        # Per later segment j, a matcher with j as its second sequence: the b2j
+        # index is built once and reused by every earlier segment compared to j
+        matchers = {}
+        energies = None  # Per-segment avg energy, batched on the first audio check
         
         for i in range(len(segments)):
+            matchers.pop(i, None)  # Only earlier segments compare against i
             if i in removed_indices:
                 continue
             
@@ -800,40 +990,65 @@ class ProfessionalRoughCutV2:
             # Look ahead for potential repetitions of THIS segment
             # (We keep the LAST version, so we look for later versions)
             window_end = min(len(segments), i + 10)  # Look ahead 10 segments max
+            # Segments are in time order, so the ones within the time window
+            # (60 seconds) form a prefix of the lookahead
+            current_end = current['end_time']
+            window_end = bisect.bisect_right(
+                segments, 60, lo=i + 1, hi=window_end,
+                key=lambda seg: seg['start_time'] - current_end
+            )
             found_later_version = False
             
+            # Length-weighted threshold (Smarter Sensitivity), set by the current segment
+            word_count = len(current['word_indices'])
+            if word_count <= 3:
+                threshold = 0.95 # Higher bar for short phrases (stops "very, very")
+            elif word_count <= 6:
+                threshold = 0.90 # SAFETY FIRST
+            else:
+                threshold = 0.85 # SAFETY FIRST
+            
+            # With at most 3 cleaned words, beating 0.95 takes the same words
+            # (2 * matches / total) or the same keywords (Jaccard), and the same
+            # words have the same keywords. Equal non-empty keyword sets score 1.0.
+            keywords_i = tokens[i][1]
+            verbatim = word_count <= 3 and len(tokens[i][0]) <= 3
+            
             for j in range(i + 1, window_end):
                 if j in removed_indices:
                     continue
                 
                 later = segments[j]
                 
-                # Check if within time window (60 seconds)
-                time_gap = later['start_time'] - current['end_time']
-                if time_gap > 60:
-                    break  # Too far apart
+                if verbatim:
+                    if not keywords_i or tokens[j][1] != keywords_i:
+                        continue
+                else:
+                    # Rule out most pairs from cheap upper bounds before the full score.
+                    # Below the keyword floor the score is at most 0.4, under every threshold.
+                    if _keyword_similarity_bound(masks[i], len(keywords_i), masks[j], len(tokens[j][1])) < self.KEYWORD_SIMILARITY_FLOOR:
+                        continue
+                    matcher = matchers.get(j)
+                    if matcher is None:
+                        matcher = matchers[j] = _word_matcher((), tokens[j][0])
+                    matcher.set_seq1(tokens[i][0])
+                    if not self._may_exceed_similarity(tokens[i], tokens[j], threshold, matcher):
+                        continue
                 
                 # Calculate similarity
-                similarity = self._calculate_similarity(current['text'], later['text'])
-                
-                # Length-weighted threshold (Smarter Sensitivity)
-                word_count = len(current['word_indices'])
-                if word_count <= 3:
-                    threshold = 0.95 # Higher bar for short phrases (stops "very, very")
-                elif word_count <= 6:
-                    threshold = 0.90 # SAFETY FIRST
-                else:
-                    threshold = 0.85 # SAFETY FIRST
+                similarity = 1.0 if verbatim else self._similarity_from_tokens(tokens[i], tokens[j], matcher)
                 
                 # If very similar, this current one is a version of the same thought
                 if similarity > threshold:
                     # --- AUDIO-AWARE HEURISTIC (New) ---
                     if self.audio_analyzer:
-                        feat_i = self.audio_analyzer.get_features(current['start_time'], current['end_time'])
-                        feat_j = self.audio_analyzer.get_features(later['start_time'], later['end_time'])
+                        if energies is None:
+                            energies = [feats.get('avg_energy', 0) for feats in self.audio_analyzer.get_features_batch(
+                                [seg['start_time'] for seg in segments], [seg['end_time'] for seg in segments]
+                            )]
                         
-                        energy_i = feat_i.get('avg_energy', 0)
-                        energy_j = feat_j.get('avg_energy', 0)
+                        energy_i = energies[i]
+                        energy_j = energies[j]
                         
                         # If the earlier take is significantly louder/more confident (>20% more energy), 
                         # we keep it and discard the later, weaker take.
@@ -861,67 +1076,90 @@ class ProfessionalRoughCutV2:
         Calculate sequence similarity.
         Also uses Semantic Keyword matching from ThoughtGrouper if available to catch rephrasings.
         """
-        # 1. Structural Similarity (difflib)
-        t1 = text1.lower().strip()
-        t2 = text2.lower().strip()
-        t1_clean = re.sub(r"[^\w\s']", '', t1)
-        t2_clean = re.sub(r"[^\w\s']", '', t2)
-        
-        matcher = difflib.SequenceMatcher(None, t1_clean, t2_clean)
-        struct_score = matcher.ratio()
-        
-        # 2. Semantic Keyword Similarity (Bag of Words)
-        # This catches "I want to go" vs "I need to leave" (different structure, similar keywords)
-        
-        k1 = self._get_keywords(text1)
-        k2 = self._get_keywords(text2)
-        
-        sem_score = 0.0
-        if k1 and k2:
-            intersection = len(k1 & k2)
-            union = len(k1 | k2)
-            sem_score = intersection / union
-            
-        # Return weighted score
-        # SAFETY FIRST: We want high structural AND high semantic similarity to cut.
-        # If they are structurally similar but have different keywords, they are likely different.
-        if sem_score < 0.7: # Increased threshold for safety
-            return struct_score * 0.4 # More aggressive penalty
-            
-        return max(struct_score, sem_score)
+        return self._similarity_from_tokens(self._similarity_tokens(text1), self._similarity_tokens(text2))
+    
+    def _similarity_exceeds(self, text1: str, text2: str, threshold: float) -> bool:
+        """_calculate_similarity(text1, text2) > threshold, ruling out dissimilar pairs from the cheap bounds first."""
+        tokens1, tokens2 = self._similarity_tokens(text1), self._similarity_tokens(text2)
+        if not self._may_exceed_similarity(tokens1, tokens2, threshold):
+            return False
+        return self._similarity_from_tokens(tokens1, tokens2) > threshold
+    
+    def _similarity_tokens(self, text: str) -> Tuple[Tuple[str, ...], frozenset]:
+        """Cleaned lowercase words and keywords, the inputs _similarity_from_tokens compares."""
+        return _text_tokens(text)
+    
+    def _similarity_from_tokens(self, tokens1: Tuple[Tuple[str, ...], frozenset], tokens2: Tuple[Tuple[str, ...], frozenset],
+                                matcher: Optional[difflib.SequenceMatcher] = None) -> float:
+        """
+        _calculate_similarity on the output of _similarity_tokens, so each text is cleaned once.
+        A matcher already set to the two word sequences (see _word_matcher) is used as is.
+        """
+        if matcher is None:
+            return _token_similarity(tokens1, tokens2, self.KEYWORD_SIMILARITY_FLOOR)
+        return _score_tokens(tokens1, tokens2, self.KEYWORD_SIMILARITY_FLOOR, matcher)
+        
+    def _may_exceed_similarity(self, tokens1: Tuple[Tuple[str, ...], frozenset], tokens2: Tuple[Tuple[str, ...], frozenset],
+                               threshold: float, matcher: Optional[difflib.SequenceMatcher] = None) -> bool:
+        """
+        False only if _similarity_from_tokens(tokens1, tokens2) <= threshold for sure.
+        Uses the keyword overlap and difflib's real_quick_ratio()/quick_ratio()
+        upper bounds, so rejected pairs never pay for SequenceMatcher.ratio().
+        """
+        k1, k2 = tokens1[1], tokens2[1]
+        if _keyword_size_bound(k1, k2) < self.KEYWORD_SIMILARITY_FLOOR:
+            sem_score = 0.0  # Jaccard is below the floor too; skip the set operations
+        else:
+            sem_score = self._keyword_similarity(k1, k2)
+        if sem_score < self.KEYWORD_SIMILARITY_FLOOR:
+            # Score is struct_score * 0.4: without enough shared keywords it stays
+            # far below the repetition thresholds
+            weight = 0.4
+        elif sem_score > threshold:
+            return True
+        else:
+            weight = 1.0
         
-    def _get_keywords(self, text: str) -> set:
+        if matcher is None:
+            matcher = _word_matcher(tokens1[0], tokens2[0])
+        return matcher.real_quick_ratio() * weight > threshold and matcher.quick_ratio() * weight > threshold
+    
+    def _keyword_similarity(self, k1: frozenset, k2: frozenset) -> float:
+        """Jaccard similarity of two keyword sets (0.0 if either is empty)."""
+        return _keyword_jaccard(k1, k2)
+        
+    def _get_keywords(self, text: str) -> frozenset:
         """Helper to extract strong keywords."""
-        # Expanded stops to exclude "weak" adjectives/adverbs that often end false starts
-        stops = {
-            'the','a','an','is','are','was','were','to','of','in','on','at','for','with','as','by','and','or','but','so','if','then','it','that','this','i','you','he','she','we','they',
-            'almost', 'maybe', 'perhaps', 'just', 'well', 'like', 'really', 'very', 'one', 'two', 'about', 'some', 'more', 'most', 'very'
-        }
-        words = set(re.sub(r"[^\w\s']", '', text.lower()).split())
-        return {w for w in words if w not in stops and len(w) > 2}
+        return self._similarity_tokens(text)[1]
 
-    def _log_decisions(self, kept_segments: List[Dict]):
+    def _log_decisions(self, kept_segments: List[Dict], all_audio_feats: Optional[list] = None):
         """
         Log decisions to ML Data Collector.
         For Phase 1, we will just log the KEPT ones to build a baseline of "Good" segments.
+        all_audio_feats, when given, is parallel to kept_segments.
         """
         if not self.use_ml: return
         
         project_id = "default_project" # To be passed in later
         
+        # Multi-modal features, computed for all segments in one pass
+        if all_audio_feats is None:
+            all_audio_feats = self.audio_analyzer.get_features_batch(
+                [s['start_time'] for s in kept_segments], [s['end_time'] for s in kept_segments]
+            ) if self.audio_analyzer else [None] * len(kept_segments)
+        
         for i, segment in enumerate(kept_segments):
             prev = kept_segments[i-1] if i > 0 else None
             next_seg = kept_segments[i+1] if i < len(kept_segments) - 1 else None
             
             try:
-                # Multi-modal features
-                audio_feats = self.audio_analyzer.get_features(segment['start_time'], segment['end_time']) if self.audio_analyzer else None
+                audio_feats = all_audio_feats[i]
                 features = self.feature_extractor.extract_features(segment, prev, next_seg, audio_feats)
                 
                 # We log "KEEP" because the heuristic kept it
                 # We need exact start/end time from word indices
-                start_time = self.words[segment['word_indices'][0]]['start']
-                end_time = self.words[segment['word_indices'][-1]]['end']
+                start_time = self._start_times[segment['word_indices'][0]]
+                end_time = self._end_times[segment['word_indices'][-1]]
                 
                 self.data_collector.log_decision(
                     project_id=project_id,
@@ -934,6 +1172,8 @@ class ProfessionalRoughCutV2:
                 )
             except Exception as e:
                 logger.warning(f"Failed to log ML decision: {e}")
+                
+        self.data_collector.flush()
 
     def _remove_phrase_stutters(self, segments: List[Dict]) -> List[Dict]:
         """
@@ -943,6 +1183,9 @@ class ProfessionalRoughCutV2:
               Sequence length must be >= 2 words (preserves "very very happy").
         """
         cleaned_segments = []
+        token_ids = {}  # Cleaned word -> small int, shared across segments
+        word_ids = {}  # Raw word text -> its token id, so each distinct word is cleaned once
+        texts = self._word_texts
         
         for segment in segments:
             # Reconstruct word objects for this segment
@@ -950,14 +1193,23 @@ class ProfessionalRoughCutV2:
             # But since segments are defined by word_indices, we can just modify the list of indices
             
             indices = segment['word_indices']
-            words_in_seg = [self.words[idx]['word'].lower().strip() for idx in indices]
-            # Remove punctuation for comparison
-            clean_words = [re.sub(r'[^\w\']', '', w) for w in words_in_seg]
+            # Compare phrases as lists of ints rather than strings
+            # (lowercased, punctuation removed)
+            ids = []
+            for idx in indices:
+                word = texts[idx]
+                token_id = word_ids.get(word)
+                if token_id is None:
+                    clean = _NON_TOKEN_CHARS.delete(word.lower().strip())
+                    token_id = word_ids[word] = token_ids.setdefault(clean, len(token_ids))
+                ids.append(token_id)
             
             to_remove_local_indices = set()
-            
-            n = len(clean_words)
-            i = 0
+
+            n = len(ids)
+            # Every stutter (2+ words) repeats a word pair, so a segment whose
+            # pairs are all distinct has none and skips the scan below
+            i = 0 if len(set(zip(ids, ids[1:]))) < n - 1 else n
             while i < n:
                 # Check for repetition of length k
                 # Try lengths from max possible down to 2
@@ -967,10 +1219,13 @@ class ProfessionalRoughCutV2:
                 max_k = min(6, (n - i) // 2)
                 
                 for k in range(max_k, 1, -1):
+                    # A repeat of length k has the same first word at i and i+k
+                    if ids[i + k] != ids[i]:
+                        continue
                     # Check if sequence [i:i+k] == [i+k:i+2k]
                     if i + 2*k <= n:
-                        phrase1 = clean_words[i : i+k]
-                        phrase2 = clean_words[i+k : i+2*k]
+                        phrase1 = ids[i : i+k]
+                        phrase2 = ids[i+k : i+2*k]
                         
                         if phrase1 == phrase2:
                             best_k = k
@@ -983,7 +1238,8 @@ class ProfessionalRoughCutV2:
                         to_remove_local_indices.add(i + offset)
                     
                     self.stats['phrase_stutters_removed'] += 1
-                    logger.info(f"Phrase Stutter: Removed \"{' '.join(words_in_seg[i:i+best_k])}\" at {self.words[indices[i]]['start']:.1f}s")
+                    removed_phrase = ' '.join(texts[idx].lower().strip() for idx in indices[i:i+best_k])
+                    logger.info(f"Phrase Stutter: Removed \"{removed_phrase}\" at {self._start_times[indices[i]]:.1f}s")
                     
                     # Advance past the first part
                     i += best_k 
@@ -999,46 +1255,51 @@ class ProfessionalRoughCutV2:
             
             if new_indices:
                 segment['word_indices'] = new_indices
-                segment['text'] = ' '.join([self.words[idx]['word'] for idx in new_indices])
-                segment['start_time'] = self.words[new_indices[0]]['start']
-                segment['end_time'] = self.words[new_indices[-1]]['end']
+                segment['text'] = self._join_words(new_indices)
+                segment['start_time'] = self._start_times[new_indices[0]]
+                segment['end_time'] = self._end_times[new_indices[-1]]
                 cleaned_segments.append(segment)
                 
         return cleaned_segments
 
-    def _apply_ml_overrides(self, segments: List[Dict]) -> List[Dict]:
+    def _apply_ml_overrides(self, segments: List[Dict]) -> Tuple[List[Dict], Optional[list]]:
         """
         Apply trained ML model to filter segments.
         If model predicts 'CUT' with high confidence (>0.8), we remove the segment
         even if heuristics kept it.
+        Returns the kept segments and their audio features (None if none were read).
         """
-        if not segments or not self.ml_model or not self.ml_model.model:
-            return segments
+        if not segments or not self.ml_model or not self.ml_model.is_ready:
+            return segments, None
             
         kept = []
+        kept_audio = []
         removed_count = 0
         
-        for i, segment in enumerate(segments):
-            prev_seg = segments[i-1] if i > 0 else None
-            next_seg = segments[i+1] if i < len(segments) - 1 else None
-            
-            # Predict CUT probability
-            # 1.0 = Definite CUT
-            # 0.0 = Definite KEEP
-            audio_feats = self.audio_analyzer.get_features(segment['start_time'], segment['end_time']) if self.audio_analyzer else None
-            prob_cut = self.ml_model.predict(segment, prev_seg, next_seg, audio_feats)
-            
+        # Predict CUT probability for all segments in one batch
+        # 1.0 = Definite CUT
+        # 0.0 = Definite KEEP
+        prev_segs = [None] + segments[:-1]
+        next_segs = segments[1:] + [None]
+        audio_feats = self.audio_analyzer.get_features_batch(
+            [s['start_time'] for s in segments], [s['end_time'] for s in segments]
+        ) if self.audio_analyzer else None
+        probs = self.ml_model.predict_batch(segments, prev_segs, next_segs, audio_feats)
+        
+        for i, (segment, prob_cut) in enumerate(zip(segments, probs)):
             # Use configurable threshold
             if prob_cut > self.ML_CUT_THRESHOLD:
                 removed_count += 1
                 logger.info(f"ML Override: Removed segment at {segment['start_time']:.1f}s (Prob Cut: {prob_cut:.2f}, Threshold: {self.ML_CUT_THRESHOLD})")
             else:
                 kept.append(segment)
+                if audio_feats is not None:
+                    kept_audio.append(audio_feats[i])
                 
         if removed_count > 0:
             logger.info(f"ML Model removed {removed_count} segments that heuristics would have kept.")
             
-        return kept
+        return kept, (kept_audio if audio_feats is not None else None)
 
     def _semantic_filtering(self, segments: List[Dict]) -> List[Dict]:
         """
@@ -1050,17 +1311,16 @@ class ProfessionalRoughCutV2:
 
         # 1. Prepare words for ThoughtGrouper
         # Segments might have been modified/trimmed, so we need to reconstruct the word list
-        all_words = []
-        for seg in segments:
-            for idx in seg['word_indices']:
-                # CRITICAL: Store original index to map back after grouping
-                word_copy = self.words[idx].copy()
-                word_copy['original_idx'] = idx
-                all_words.append(word_copy)
+        # CRITICAL: kept_indices[i] is the original index of all_words[i], used to map
+        # back after grouping. ThoughtGrouper only reads the words, so the dicts are
+        # shared rather than copied and tagged one by one.
+        kept_indices = [idx for seg in segments for idx in seg['word_indices']]
+        words = self.words
+        all_words = [words[idx] for idx in kept_indices]
 
         # 2. Run ThoughtGrouper
         from .thought_grouper import ThoughtGrouper
-        grouper = ThoughtGrouper(all_words)
+        grouper = ThoughtGrouper(all_words, starts=self._starts[kept_indices], ends=self._ends[kept_indices])
         thoughts = grouper.group_into_thoughts()
 
         # 3. Filter segments based on thought classification
@@ -1071,6 +1331,12 @@ class ProfessionalRoughCutV2:
         filtered_segments = []
         # Store segments by their word indices to easily check inclusion
         segments_by_first_idx = {seg['word_indices'][0]: seg for seg in segments}
+        # Positions in all_words holding a segment's first word, in order. Each
+        # thought covers positions start_idx..end_idx, so its segments are found
+        # by bisecting this list instead of checking every word of the thought
+        first_positions = np.flatnonzero(
+            np.isin(np.asarray(kept_indices), np.fromiter(segments_by_first_idx, dtype=np.int64))
+        ).tolist()
         
         indices_to_remove = set()
         
@@ -1087,12 +1353,11 @@ class ProfessionalRoughCutV2:
                      # Determine if we are cutting a massive block for a small repetition
                      source_thought = thoughts[source_idx]
                      
-                     # Calculate similarity between source and current
-                     thought_sim = self._calculate_similarity(source_thought['text'], thought['text'])
-                     
                      # If source is huge (>50 words) and current is small (<10 words), likely a false positive match
-                     # OR if they are not extremely similar semantically (>95%)
-                     if (source_thought['word_count'] > 50 and thought['word_count'] < 10) or thought_sim < 0.95:
+                     # OR if they are not extremely similar semantically (>95%).
+                     # The similarity between source and current is only scored when the sizes don't decide it
+                     if (source_thought['word_count'] > 50 and thought['word_count'] < 10) or \
+                             self._calculate_similarity(source_thought['text'], thought['text']) < 0.95:
                          logger.info(f"Semantic Filter: ABORTED 'Keep Last'. Source {source_idx} is too different or too big to be replaced.")
                      else:
                          indices_to_remove.add(source_idx)
@@ -1127,12 +1392,11 @@ class ProfessionalRoughCutV2:
             
             # Find which segments belong to this thought
             # FIX: We must map the thought's word indices back to the original indices used in segments
-            for thought_word_idx in thought['word_indices']:
-                # The word at thought_word_idx in all_words has the original index
-                orig_idx = all_words[thought_word_idx]['original_idx']
-                
-                if orig_idx in segments_by_first_idx:
-                    filtered_segments.append(segments_by_first_idx[orig_idx])
+            lo = bisect.bisect_left(first_positions, thought['start_idx'])
+            hi = bisect.bisect_right(first_positions, thought['end_idx'])
+            for position in first_positions[lo:hi]:
+                # The word at position in all_words has the original index
+                filtered_segments.append(segments_by_first_idx[kept_indices[position]])
 
         # Note: This logic assumes segments are whole units within thoughts.
         # Since _refine_segmentation splits by punctuation and ThoughGrouper merges by sentences, 
@@ -1171,15 +1435,35 @@ class ProfessionalRoughCutV2:
         Ensure no gaps at segment beginnings (tight pacing).
         """
         final = []
+        first_indices = []
+        last_indices = []
         
         # Padding in seconds (User Request: 0.15s Pre/Post)
         # Anti-Aggression Smoothing
         PADDING_START = 0.15  
         PADDING_END = 0.15    
         
-        for segment in segments:
+        # Without any deleted words the segments' index lists are used as they are
+        # (the intermediate segments are discarded after this)
+        any_deleted = 1 in self._deleted
+        if any_deleted:
+            # Deleted words per segment, counted for all segments in one pass, so
+            # only segments that contain some are filtered word by word
+            offsets = np.cumsum([0] + [len(seg['word_indices']) for seg in segments])
+            flat = np.fromiter(itertools.chain.from_iterable(seg['word_indices'] for seg in segments),
+                               dtype=np.int64, count=int(offsets[-1]))
+            deleted_before = np.concatenate(([0], np.cumsum(np.frombuffer(self._deleted, dtype=np.uint8)[flat])))
+            deleted_counts = (deleted_before[offsets[1:]] - deleted_before[offsets[:-1]]).tolist()
+        
+        for k, segment in enumerate(segments):
             # Filter out words that are marked as deleted within the segment
-            filtered_indices = [idx for idx in segment['word_indices'] if not self.words[idx].get('isDeleted', False)]
+            if any_deleted and deleted_counts[k]:
+                if len(segment['word_indices']) - deleted_counts[k] < self.MIN_SEGMENT_LENGTH:
+                    filtered_indices = ()  # Skipped below; no need to build the list
+                else:
+                    filtered_indices = [idx for idx in segment['word_indices'] if not self._deleted[idx]]
+            else:
+                filtered_indices = segment['word_indices']
             
             if len(filtered_indices) < self.MIN_SEGMENT_LENGTH:
                 # If skipping, log why if it's due to deletion
@@ -1188,21 +1472,27 @@ class ProfessionalRoughCutV2:
                 continue
             
             # Actual start and end based on filtered words
-            actual_start = self.words[filtered_indices[0]]['start']
-            actual_end = self.words[filtered_indices[-1]]['end']
+            actual_start = self._start_times[filtered_indices[0]]
+            actual_end = self._end_times[filtered_indices[-1]]
             
             # Apply padding but stay within word boundaries if it's the very first/last word of the asset
             padded_start = max(0, actual_start - PADDING_START)
             padded_end = actual_end + PADDING_END
+            first_indices.append(filtered_indices[0])
+            last_indices.append(filtered_indices[-1])
             
             final.append({
                 'start': padded_start,
                 'end': padded_end,
-                'text': ' '.join([self.words[idx]['word'] for idx in filtered_indices]),
+                'text': self._join_words(filtered_indices),
                 'word_count': len(filtered_indices),
                 'word_indices': filtered_indices
             })
         
+        # Same padding as above, applied to the whole cut at once
+        self._seg_starts = np.maximum(self._starts[first_indices] - PADDING_START, 0.0)
+        self._seg_ends = self._ends[last_indices] + PADDING_END
+        
         return final
     
     def get_statistics(self) -> Dict:
@@ -1211,10 +1501,10 @@ class ProfessionalRoughCutV2:
         final_duration = 0.0
         
         if self.words:
-            original_duration = self.words[-1]['end'] - self.words[0]['start']
+            original_duration = self._end_times[-1] - self._start_times[0]
         
         if self.segments:
-            final_duration = sum(s['end'] - s['start'] for s in self.segments)
+            final_duration = float((self._seg_ends - self._seg_starts).sum())
             
         time_saved = original_duration - final_duration
         reduction = (1 - final_duration / original_duration) * 100 if original_duration > 0 else 0
@@ -9,37 +9,69 @@ Groups words into meaningful semantic units ("thoughts") based on:
 """
 
 import logging
-from typing import List, Dict, Set
+from typing import List, Dict, Set, Optional
 import re
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# Everything except word characters, whitespace and apostrophes (kept for "don't")
+_NON_KEYWORD_CHARS = re.compile(r"[^\w\s']")
+
+# Built once at import and shared by every grouper and _has_subject_verb call
+STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been',
+    'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would',
+    'could', 'should', 'may', 'might', 'can', 'to', 'of', 'in',
+    'on', 'at', 'for', 'with', 'as', 'by', 'from', 'and', 'or',
+    'but', 'if', 'then', 'so', 'it', 'that', 'this', 'these',
+    'those', 'i', 'you', 'he', 'she', 'we', 'they', 'me', 'him',
+    'her', 'us', 'them', 'my', 'your', 'his', 'our', 'their'
+})
+
+# Common pronouns (subjects) and verbs for the subject-verb heuristic
+_SUBJECT_WORDS = frozenset({'i', 'you', 'he', 'she', 'it', 'we', 'they', 'this', 'that'})
+_VERB_WORDS = frozenset({
+    'is', 'are', 'was', 'were', 'be', 'been', 'being',
+    'have', 'has', 'had', 'do', 'does', 'did',
+    'will', 'would', 'could', 'should', 'can', 'may',
+    'go', 'goes', 'went', 'come', 'came', 'get', 'got',
+    'make', 'made', 'see', 'saw', 'know', 'knew', 'think',
+    'want', 'need', 'like', 'love', 'hate'
+})
+
 
 class ThoughtGrouper:
-    def __init__(self, words: List[Dict]):
+    def __init__(self, words: List[Dict], starts: Optional[np.ndarray] = None, ends: Optional[np.ndarray] = None):
         """
         Initialize with word-level transcript.
         Words expected format: [{'word': str, 'start': float, 'end': float}, ...]
         Times in seconds.
+        Optional starts/ends are pre-built float64 arrays parallel to words.
         """
         self.words = words
+        
+        if starts is None or ends is None:
+            starts = np.fromiter((w['start'] for w in words), dtype=np.float64, count=len(words))
+            ends = np.fromiter((w['end'] for w in words), dtype=np.float64, count=len(words))
+        self._starts = starts
+        self._ends = ends
+        # Per-word fields as flat lists (plain floats for the times), so sentences
+        # are built from slices instead of one dict lookup per word
+        self._word_texts = [w['word'] for w in words]
+        self._start_times = starts.tolist()
+        self._end_times = ends.tolist()
         self.thoughts = []
         
         # Thresholds
         self.THOUGHT_PAUSE_THRESHOLD = 0.4  # Reduced: Only merge if thoughts are very close (rushed)
         self.SEMANTIC_SIMILARITY_THRESHOLD = 0.8  # Increased: Only merge sentences if they are almost identical in topic
         self.REPETITION_THRESHOLD = 0.85  # Strict: Only flag as repetition if highly similar (85%+)
+        self.REPETITION_LOOKBACK = 10  # Max thoughts back a repetition can refer to
         
-        # Common stop words to ignore in semantic analysis
-        self.STOP_WORDS = {
-            'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been',
-            'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would',
-            'could', 'should', 'may', 'might', 'can', 'to', 'of', 'in',
-            'on', 'at', 'for', 'with', 'as', 'by', 'from', 'and', 'or',
-            'but', 'if', 'then', 'so', 'it', 'that', 'this', 'these',
-            'those', 'i', 'you', 'he', 'she', 'we', 'they', 'me', 'him',
-            'her', 'us', 'them', 'my', 'your', 'his', 'her', 'our', 'their'
-        }
+        # Common stop words to ignore in semantic analysis (shared module-level set)
+        self.STOP_WORDS = STOP_WORDS
     
     def group_into_thoughts(self) -> List[Dict]:
         """
@@ -71,48 +103,44 @@ class ThoughtGrouper:
     def _group_into_sentences(self) -> List[Dict]:
         """Group words into sentences based on punctuation and pauses."""
         sentences = []
-        current_sentence_words = []
         start_idx = 0
         
-        for i, word in enumerate(self.words):
-            current_sentence_words.append(i)
-            
-            # Check for sentence-ending punctuation
-            word_text = word['word'].rstrip()
-            ends_with_punctuation = word_text.endswith(('.', '!', '?'))
-            
-            # Check for significant pause after this word
-            has_pause = False
-            if i < len(self.words) - 1:
-                gap = self.words[i + 1]['start'] - word['end']
-                has_pause = gap > 0.5  # 500ms pause
-            
+        # Boundary flags for every word, computed up front:
+        # sentence-ending punctuation, and a significant pause (> 500ms) after
+        # the word (never after the last word).
+        ends_with_punctuation = np.fromiter(
+            (text.rstrip().endswith(('.', '!', '?')) for text in self._word_texts),
+            dtype=bool, count=len(self.words)
+        )
+        pause_after = np.zeros(len(self.words), dtype=bool)
+        pause_after[:-1] = (self._starts[1:] - self._ends[:-1]) > 0.5
+        
+        # Only words with punctuation or a pause after them can end a sentence
+        candidates = np.flatnonzero(ends_with_punctuation | pause_after).tolist()
+        ends_with_punctuation = ends_with_punctuation.tolist()
+        for i in candidates:
             # End sentence if punctuation OR significant pause
-            if ends_with_punctuation or (has_pause and len(current_sentence_words) > 3):
-                sentences.append({
-                    'word_indices': current_sentence_words,
-                    'start_idx': start_idx,
-                    'end_idx': i,
-                    'start_time': self.words[start_idx]['start'],
-                    'end_time': word['end'],
-                    'text': ' '.join([self.words[idx]['word'] for idx in current_sentence_words])
-                })
-                current_sentence_words = []
+            if ends_with_punctuation[i] or i - start_idx + 1 > 3:
+                sentences.append(self._make_sentence(start_idx, i))
                 start_idx = i + 1
         
         # Add remaining words as a sentence
-        if current_sentence_words:
-            sentences.append({
-                'word_indices': current_sentence_words,
-                'start_idx': start_idx,
-                'end_idx': len(self.words) - 1,
-                'start_time': self.words[start_idx]['start'],
-                'end_time': self.words[-1]['end'],
-                'text': ' '.join([self.words[idx]['word'] for idx in current_sentence_words])
-            })
+        if start_idx < len(self.words):
+            sentences.append(self._make_sentence(start_idx, len(self.words) - 1))
         
         return sentences
     
+    def _make_sentence(self, start_idx: int, end_idx: int) -> Dict:
+        """Sentence object for the words start_idx..end_idx (inclusive)."""
+        return {
+            'word_indices': list(range(start_idx, end_idx + 1)),
+            'start_idx': start_idx,
+            'end_idx': end_idx,
+            'start_time': self._start_times[start_idx],
+            'end_time': self._end_times[end_idx],
+            'text': ' '.join(self._word_texts[start_idx:end_idx + 1])
+        }
+    
     def _merge_sentences_into_thoughts(self, sentences: List[Dict]) -> List[Dict]:
         """
         Merge related sentences into coherent thoughts.
@@ -123,6 +151,8 @@ class ThoughtGrouper:
         
         thoughts = []
         current_thought_sentences = [sentences[0]]
+        # Each sentence is compared with both neighbours; extract its keywords once
+        keywords = [self._extract_keywords(sent['text']) for sent in sentences]
         
         for i in range(1, len(sentences)):
             prev_sentence = sentences[i - 1]
@@ -132,10 +162,7 @@ class ThoughtGrouper:
             pause = curr_sentence['start_time'] - prev_sentence['end_time']
             
             # Check semantic similarity
-            similarity = self._calculate_semantic_similarity(
-                prev_sentence['text'],
-                curr_sentence['text']
-            )
+            similarity = self._keyword_similarity(keywords[i - 1], keywords[i])
             
             # Decide whether to merge or start new thought
             should_merge = (
@@ -182,30 +209,65 @@ class ThoughtGrouper:
         Returns 0.0 to 1.0 (higher = more similar).
         """
         # Extract keywords (remove stop words)
-        keywords1 = self._extract_keywords(text1)
-        keywords2 = self._extract_keywords(text2)
-        
+        return self._keyword_similarity(self._extract_keywords(text1), self._extract_keywords(text2))
+    
+    def _keyword_similarity(self, keywords1: Set[str], keywords2: Set[str]) -> float:
+        """Jaccard similarity of two keyword sets from _extract_keywords."""
         if not keywords1 or not keywords2:
             return 0.0
         
-        # Calculate Jaccard similarity
+        # Calculate Jaccard similarity (union size from the intersection, so
+        # only one temporary set is built)
         intersection = len(keywords1 & keywords2)
-        union = len(keywords1 | keywords2)
+        union = len(keywords1) + len(keywords2) - intersection
         
         return intersection / union if union > 0 else 0.0
     
+    def _keyword_mask(self, keywords: Set[str], vocabulary: Dict[str, int]) -> int:
+        """Bitset of keywords, one bit per word in vocabulary (new words are added to it)."""
+        mask = 0
+        for word in keywords:
+            mask |= 1 << vocabulary.setdefault(word, len(vocabulary))
+        return mask
+    
+    def _mask_similarity(self, mask1: int, size1: int, mask2: int, size2: int) -> float:
+        """_keyword_similarity of two keyword sets given as _keyword_mask bitsets and their sizes."""
+        if not size1 or not size2:
+            return 0.0
+        intersection = (mask1 & mask2).bit_count()
+        return intersection / (size1 + size2 - intersection)
+    
+    def _keyword_similarity_bound(self, keywords1: Set[str], keywords2: Set[str]) -> float:
+        """
+        Upper bound on _keyword_similarity from the set sizes alone: the
+        intersection is at most the smaller set and the union at least the larger.
+        """
+        if not keywords1 or not keywords2:
+            return 0.0
+        return min(len(keywords1), len(keywords2)) / max(len(keywords1), len(keywords2))
+    
+    def _is_dissimilar(self, keywords1: Set[str], keywords2: Set[str], threshold: float) -> bool:
+        """_keyword_similarity(keywords1, keywords2) < threshold, without the set work when the bound decides it."""
+        if self._keyword_similarity_bound(keywords1, keywords2) < threshold:
+            return True
+        return self._keyword_similarity(keywords1, keywords2) < threshold
+    
     def _extract_keywords(self, text: str) -> Set[str]:
         """Extract meaningful keywords from text."""
         # Lowercase and remove punctuation
-        text = text.lower()
+        return self._keywords_from_lower(text.lower())
+    
+    def _keywords_from_lower(self, text: str) -> Set[str]:
+        """_extract_keywords for text that is already lowercase."""
         # Keep internal apostrophes for words like "don't"
-        text = re.sub(r"[^\w\s']", '', text)
+        text = _NON_KEYWORD_CHARS.sub('', text)
         
         # Split into words and filter stop words
         words = text.split()
         # Only keep words with length >= 3 and not in stop words
         # Adjusted to >= 3 to catch words like "so", "do" if they are important
-        keywords = {w for w in words if w not in self.STOP_WORDS and len(w) >= 3}
+        stop_words = self.STOP_WORDS
+        keywords = {w for w in words if w not in stop_words and len(w) >= 3}
         
         # Critical Fix: If keyword set is empty/small, don't rely on it for similarity (avoids false positives on short sentences)
         if len(keywords) < 2:
@@ -249,21 +311,8 @@ class ThoughtGrouper:
         """
         words = text.lower().split()
         
-        # Common pronouns (subjects)
-        subjects = {'i', 'you', 'he', 'she', 'it', 'we', 'they', 'this', 'that'}
-        
-        # Common verbs
-        verbs = {
-            'is', 'are', 'was', 'were', 'be', 'been', 'being',
-            'have', 'has', 'had', 'do', 'does', 'did',
-            'will', 'would', 'could', 'should', 'can', 'may',
-            'go', 'goes', 'went', 'come', 'came', 'get', 'got',
-            'make', 'made', 'see', 'saw', 'know', 'knew', 'think',
-            'want', 'need', 'like', 'love', 'hate'
-        }
-        
-        has_subject = any(w in subjects for w in words)
-        has_verb = any(w in verbs for w in words)
+        has_subject = not _SUBJECT_WORDS.isdisjoint(words)
+        has_verb = not _VERB_WORDS.isdisjoint(words)
         
         return has_subject or has_verb  # Either is good enough
     
@@ -275,6 +324,18 @@ class ThoughtGrouper:
         - filler: Very short, low coherence
         - repetition: High similarity to ANY previous thought (not just consecutive)
         """
+        # Every thought is compared with up to REPETITION_LOOKBACK others, so
+        # normalize each text (keywords, lowercase text and its words) once
+        lowered = [thought['text'].lower() for thought in thoughts]
+        keywords = [self._keywords_from_lower(text) for text in lowered]
+        lowered_words = [text.split() for text in lowered]
+        word_sets = [set(words) for words in lowered_words]
+        # Keywords as int bitsets over a shared vocabulary, so the Jaccard of two
+        # thoughts is one AND and a popcount instead of a set intersection
+        vocabulary = {}
+        masks = [self._keyword_mask(k, vocabulary) for k in keywords]
+        sizes = [len(k) for k in keywords]
+        
         for i, thought in enumerate(thoughts):
             # Default classification
             thought_type = 'main_point'
@@ -283,35 +344,28 @@ class ThoughtGrouper:
             if thought['word_count'] < 3 and thought['coherence_score'] < 0.5:
                 thought_type = 'filler'
             
-            # Check if it's a repetition - scan ALL previous thoughts within a reasonable window
+            # Check if it's a repetition - scan previous thoughts within a reasonable window
             elif i > 0:
-                # Look back at all previous thoughts (not just immediate previous)
-                # Use a sliding window of last 20 thoughts or all if fewer
-                window_start = max(0, i - 20)
-                prev_thoughts = thoughts[window_start:i]
+                # Look back at previous thoughts (not just immediate previous).
+                # Only the last REPETITION_LOOKBACK thoughts can be flagged, so older
+                # ones are not compared at all.
+                window_start = max(0, i - self.REPETITION_LOOKBACK)
                 
-                for prev_thought in prev_thoughts:
-                    # Calculate semantic similarity
-                    similarity = self._calculate_semantic_similarity(
-                        thought['text'],
-                        prev_thought['text']
-                    )
-                    
-                    # Also check for exact phrase repeats (word-for-word)
-                    exact_match = self._check_exact_phrase_match(
-                        thought['text'],
-                        prev_thought['text']
-                    )
+                for prev_idx in range(window_start, i):
+                    prev_thought = thoughts[prev_idx]
+                    # Calculate semantic similarity (skipped when the set sizes
+                    # alone rule out passing the threshold)
+                    could_repeat = self._keyword_similarity_bound(keywords[i], keywords[prev_idx]) > self.REPETITION_THRESHOLD
+                    similarity = self._mask_similarity(masks[i], sizes[i], masks[prev_idx], sizes[prev_idx]) if could_repeat else 0.0
                     
                     # Mark as repetition if:
                     # - Very high semantic similarity OR
-                    # - Has exact phrase matches of significant length
-                    # - BUT only if it's within a reasonable lookback (e.g. 10 thoughts)
-                    is_recent = (i - thoughts.index(prev_thought)) <= 10
-                    
-                    if (similarity > self.REPETITION_THRESHOLD or exact_match) and is_recent:
+                    # - Has exact phrase matches of significant length (word-for-word)
+                    if similarity > self.REPETITION_THRESHOLD or self._shares_exact_phrase(lowered_words[i], lowered[prev_idx], word_sets[prev_idx]):
+                        if not could_repeat:
+                            similarity = self._mask_similarity(masks[i], sizes[i], masks[prev_idx], sizes[prev_idx])
                         thought_type = 'repetition'
-                        thought['repeated_thought_idx'] = thoughts.index(prev_thought)
+                        thought['repeated_thought_idx'] = prev_idx
                         logger.info(f"Repetition detected at {thought['start_time']:.1f}s "
                                   f"(similar/identical to {prev_thought['start_time']:.1f}s, "
                                   f"idx={thought['repeated_thought_idx']}, "
@@ -320,13 +374,7 @@ class ThoughtGrouper:
             
             # Check if it's a tangent (low similarity to neighbors)
             if thought_type == 'main_point' and i > 0 and i < len(thoughts) - 1:
-                prev_thought = thoughts[i - 1]
-                next_thought = thoughts[i + 1]
-                
-                prev_sim = self._calculate_semantic_similarity(thought['text'], prev_thought['text'])
-                next_sim = self._calculate_semantic_similarity(thought['text'], next_thought['text'])
-                
-                if prev_sim < 0.2 and next_sim < 0.2:
+                if self._is_dissimilar(keywords[i], keywords[i - 1], 0.2) and self._is_dissimilar(keywords[i], keywords[i + 1], 0.2):
                     thought_type = 'tangent'
             
             thought['type'] = thought_type
@@ -337,17 +385,36 @@ class ThoughtGrouper:
         Returns True if they have matching sequences of 4+ words.
         """
         # Normalize texts
-        words1 = text1.lower().split()
-        words2 = text2.lower().split()
-        
+        return self._shares_exact_phrase(text1.lower().split(), text2.lower())
+    
+    def _shares_exact_phrase(self, words1: List[str], text2_lower: str, words2: Optional[Set[str]] = None) -> bool:
+        """
+        _check_exact_phrase_match on pre-normalized input (text1's lowercase words,
+        text2 lowercased). words2, the set of text2's words, can be passed in when
+        text2 is compared against many texts.
+        """
         # Check for matching sequences of at least 8 words
         min_sequence_length = 8
         
+        # In a match, the inner words of the window are whole words of text2
+        # (spaces on both sides), so a window with an inner word missing from
+        # text2 cannot match and is skipped without building the phrase.
+        if words2 is None:
+            words2 = set(text2_lower.split())
+        last_missing = -1  # Latest position whose word is not in text2
+        
         for i in range(len(words1) - min_sequence_length + 1):
+            last_inner = i + min_sequence_length - 2
+            for k in range(i + 1 if i == 0 else last_inner, last_inner + 1):
+                if words1[k] not in words2:
+                    last_missing = k
+            if last_missing > i:
+                continue
+                
             # Get a sequence of 4+ words from text1
             sequence = ' '.join(words1[i:i + min_sequence_length])
             # Check if this sequence appears in text2
-            if sequence in text2.lower():
+            if sequence in text2_lower:
                 return True
         
         return False
@@ -7,6 +7,9 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Everything but lowercase ASCII letters, stripped before counting syllables
+_NON_LOWER_ALPHA = re.compile(r'[^a-z]')
+
 def count_syllables(word: str) -> int:
     """
     Estimate syllable count for a word.
@@ -14,7 +17,8 @@ def count_syllables(word: str) -> int:
     """
     word = word.lower().strip()
     # Remove non-alphabetic characters for counting
-    word = re.sub(r'[^a-z]', '', word)
+    if not (word.isascii() and word.isalpha()):  # Plain words (the common case) need no regex pass
+        word = _NON_LOWER_ALPHA.sub('', word)
     
     if len(word) <= 2:
         return 1
@@ -1,5 +1,5 @@
 # SQLAlchemy ORM models
-from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, Text, JSON
+from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, Text, JSON, Index
 from sqlalchemy.orm import relationship
 from .database import Base
 
@@ -23,6 +23,10 @@ class Project(Base):
 class Segment(Base):
     """Segment entity representing a portion of video content."""
     __tablename__ = "segments"
+    __table_args__ = (
+        # Project lookups (load, delete, re-transcribe) and time-range matching
+        Index("ix_seg_project_time", "projectId", "start", "end"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     projectId = Column(String, ForeignKey("projects.id"))
@@ -9,8 +9,9 @@ Features include:
 - Sentiment: Positive/negative tone, Emotional indicators
 """
 
+import functools
 import re
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 
 # Try to import sentiment analysis (optional dependency)
 try:
@@ -19,6 +20,132 @@ try:
 except ImportError:
     SENTIMENT_AVAILABLE = False
 
+# Bump when FEATURE_NAMES or the way a feature is computed changes; stored
+# feature vectors from another version are not reused.
+FEATURES_VERSION = 2
+
+# Version 1 schema: the original timing/text features. Models trained on it
+# still load; predictions just select these columns.
+FEATURE_NAMES_V1 = [
+    'duration', 'word_count', 'speech_rate',
+    'pause_before', 'pause_after',
+    'stop_word_ratio', 'starts_with_repeat', 'has_filler'
+]
+
+# Model input order for the features returned by extract_features (version 2).
+# Shared by the model and the binary decision log, so keep it append-only.
+FEATURE_NAMES_V2 = [
+    # Timing features (5)
+    'duration', 'word_count', 'speech_rate',
+    'pause_before', 'pause_after',
+    
+    # Text features (4)
+    'stop_word_ratio', 'starts_with_repeat', 'has_filler', 'filler_count',
+    
+    # Linguistic complexity features (4)
+    'unique_word_ratio', 'avg_word_length',
+    'question_count', 'exclamation_count',
+    
+    # Sentiment features (3)
+    'sentiment_positive', 'sentiment_negative', 'sentiment_subjectivity',
+    
+    # Contextual features (2)
+    'position_in_video', 'time_since_last_cut',
+    
+    # Audio features (4)
+    'avg_energy', 'energy_variance', 'avg_pitch', 'pitch_stability'
+]
+
+FEATURE_NAMES = FEATURE_NAMES_V2
+
+# Word lists are built once at import instead of per extractor / per call
+STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been',
+    'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would',
+    'could', 'should', 'may', 'might', 'can', 'to', 'of', 'in',
+    'on', 'at', 'for', 'with', 'as', 'by', 'from', 'and', 'or',
+    'but', 'if', 'then', 'so', 'it', 'that', 'this', 'these',
+    'those', 'i', 'you', 'he', 'she', 'we', 'they', 'me', 'him',
+    'her', 'us', 'them', 'my', 'your', 'his', 'our', 'their'
+})
+
+FILLERS = frozenset({
+    'um', 'uh', 'like', 'you know', 'sort of', 'kind of', 'i mean',
+    'basically', 'actually', 'literally', 'honestly', 'so yeah',
+    'erm', 'ah', 'hmm', 'well'
+})
+
+# Fallback sentiment lexicon (used when TextBlob is unavailable)
+POSITIVE_WORDS = frozenset({'good', 'great', 'excellent', 'amazing', 'love', 'yes', 'perfect', 'wonderful'})
+NEGATIVE_WORDS = frozenset({'bad', 'terrible', 'awful', 'hate', 'no', 'wrong', 'horrible', 'worst'})
+
+WORD_PATTERN = re.compile(r'\b\w+\b')
+
+
+@functools.lru_cache(maxsize=4096)
+def _text_features(text: str) -> Tuple[Tuple[str, ...], float, Tuple[Tuple[str, float], ...]]:
+    """
+    The features that depend on the segment text alone: its lowercase words,
+    the stop word ratio and the filler/complexity/sentiment features in output
+    order. Cached by text: the overrides and the decision log score the same
+    segments, and re-runs of an edit see the same texts again.
+    """
+    text_lower = text.lower()
+    words = WORD_PATTERN.findall(text_lower)
+    
+    # Stop word ratio
+    stop_count = sum(1 for w in words if w in STOP_WORDS)
+    stop_word_ratio = round(stop_count / len(words), 3) if words else 0
+    
+    features = {}
+    
+    # Enhanced filler detection
+    features['filler_count'] = sum(1 for f in FILLERS if f in text_lower)
+    features['has_filler'] = 1.0 if features['filler_count'] > 0 else 0.0
+    
+    # --- NEW: LINGUISTIC COMPLEXITY FEATURES ---
+    
+    # Unique word ratio (vocabulary richness)
+    unique_words = set(words)
+    features['unique_word_ratio'] = round(len(unique_words) / len(words), 3) if words else 0
+    
+    # Average word length (complexity indicator)
+    avg_length = sum(len(w) for w in words) / len(words) if words else 0
+    features['avg_word_length'] = round(avg_length, 2)
+    
+    # Question/exclamation counts (engagement markers)
+    features['question_count'] = text.count('?')
+    features['exclamation_count'] = text.count('!')
+    
+    # --- NEW: SENTIMENT FEATURES ---
+    if SENTIMENT_AVAILABLE:
+        try:
+            blob = TextBlob(text)
+            # Polarity: -1 (negative) to 1 (positive)
+            polarity = blob.sentiment.polarity
+            
+            features['sentiment_positive'] = round(max(0, polarity), 3)
+            features['sentiment_negative'] = round(max(0, -polarity), 3)
+            
+            # Subjectivity: 0 (objective) to 1 (subjective)
+            features['sentiment_subjectivity'] = round(blob.sentiment.subjectivity, 3)
+        except Exception:
+            # Fallback if sentiment analysis fails
+            features['sentiment_positive'] = 0.0
+            features['sentiment_negative'] = 0.0
+            features['sentiment_subjectivity'] = 0.0
+    else:
+        # Manual sentiment heuristics if TextBlob unavailable
+        pos_count = sum(1 for w in words if w in POSITIVE_WORDS)
+        neg_count = sum(1 for w in words if w in NEGATIVE_WORDS)
+        
+        features['sentiment_positive'] = round(pos_count / len(words), 3) if words else 0
+        features['sentiment_negative'] = round(neg_count / len(words), 3) if words else 0
+        features['sentiment_subjectivity'] = 0.5  # Neutral fallback
+    
+    return tuple(words), stop_word_ratio, tuple(features.items())
+
+
 class FeatureExtractor:
     def __init__(self, total_video_duration: float = None):
         """
@@ -29,21 +156,9 @@ class FeatureExtractor:
         """
         self.total_video_duration = total_video_duration
         
-        self.STOP_WORDS = {
-            'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been',
-            'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would',
-            'could', 'should', 'may', 'might', 'can', 'to', 'of', 'in',
-            'on', 'at', 'for', 'with', 'as', 'by', 'from', 'and', 'or',
-            'but', 'if', 'then', 'so', 'it', 'that', 'this', 'these',
-            'those', 'i', 'you', 'he', 'she', 'we', 'they', 'me', 'him',
-            'her', 'us', 'them', 'my', 'your', 'his', 'her', 'our', 'their'
-        }
-        
-        self.FILLERS = {
-            'um', 'uh', 'like', 'you know', 'sort of', 'kind of', 'i mean',
-            'basically', 'actually', 'literally', 'honestly', 'so yeah',
-            'erm', 'ah', 'hmm', 'well'
-        }
+        # Shared module-level sets (kept as attributes for existing callers)
+        self.STOP_WORDS = STOP_WORDS
+        self.FILLERS = FILLERS
 
     def extract_features(self, segment: Dict, prev_segment: Optional[Dict] = None, next_segment: Optional[Dict] = None, audio_features: Optional[Dict] = None) -> Dict[str, float]:
         """
@@ -73,69 +188,18 @@ class FeatureExtractor:
             features['pause_after'] = 1.0 # Default end padding
 
         # --- TEXT FEATURES ---
-        text = segment['text']
-        text_lower = text.lower()
-        words = re.findall(r'\b\w+\b', text_lower)
-        
-        # Stop word ratio
-        stop_count = sum(1 for w in words if w in self.STOP_WORDS)
-        features['stop_word_ratio'] = round(stop_count / len(words), 3) if words else 0
+        words, features['stop_word_ratio'], text_features = _text_features(segment['text'])
         
         # Repetition (Immediate stutter check)
         features['starts_with_repeat'] = 0.0
         if prev_segment:
-            prev_text = prev_segment['text'].lower()
-            prev_words = re.findall(r'\b\w+\b', prev_text)
+            prev_words = _text_features(prev_segment['text'])[0]
             if len(words) >= 2 and len(prev_words) >= 2:
                 if words[:2] == prev_words[-2:]:
                     features['starts_with_repeat'] = 1.0
 
-        # Enhanced filler detection
-        features['filler_count'] = sum(1 for f in self.FILLERS if f in text_lower)
-        features['has_filler'] = 1.0 if features['filler_count'] > 0 else 0.0
-        
-        # --- NEW: LINGUISTIC COMPLEXITY FEATURES ---
-        
-        # Unique word ratio (vocabulary richness)
-        unique_words = set(words)
-        features['unique_word_ratio'] = round(len(unique_words) / len(words), 3) if words else 0
-        
-        # Average word length (complexity indicator)
-        avg_length = sum(len(w) for w in words) / len(words) if words else 0
-        features['avg_word_length'] = round(avg_length, 2)
-        
-        # Question/exclamation counts (engagement markers)
-        features['question_count'] = text.count('?')
-        features['exclamation_count'] = text.count('!')
-        
-        # --- NEW: SENTIMENT FEATURES ---
-        if SENTIMENT_AVAILABLE:
-            try:
-                blob = TextBlob(text)
-                # Polarity: -1 (negative) to 1 (positive)
-                polarity = blob.sentiment.polarity
-                
-                features['sentiment_positive'] = round(max(0, polarity), 3)
-                features['sentiment_negative'] = round(max(0, -polarity), 3)
-                
-                # Subjectivity: 0 (objective) to 1 (subjective)
-                features['sentiment_subjectivity'] = round(blob.sentiment.subjectivity, 3)
-            except Exception:
-                # Fallback if sentiment analysis fails
-                features['sentiment_positive'] = 0.0
-                features['sentiment_negative'] = 0.0
-                features['sentiment_subjectivity'] = 0.0
-        else:
-            # Manual sentiment heuristics if TextBlob unavailable
-            positive_words = {'good', 'great', 'excellent', 'amazing', 'love', 'yes', 'perfect', 'wonderful'}
-            negative_words = {'bad', 'terrible', 'awful', 'hate', 'no', 'wrong', 'horrible', 'worst'}
-            
-            pos_count = sum(1 for w in words if w in positive_words)
-            neg_count = sum(1 for w in words if w in negative_words)
-            
-            features['sentiment_positive'] = round(pos_count / len(words), 3) if words else 0
-            features['sentiment_negative'] = round(neg_count / len(words), 3) if words else 0
-            features['sentiment_subjectivity'] = 0.5  # Neutral fallback
+        # Filler, complexity and sentiment features
+        features.update(text_features)
         
         # --- NEW: CONTEXTUAL FEATURES ---
         
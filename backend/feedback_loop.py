@@ -5,11 +5,16 @@ Reconciles the "Final Timeline" (what the user kept) with the "Rough Cut Logs" (
 Updates the training data with ground truth labels.
 """
 
+import bisect
 import json
 import os
 import logging
 from typing import List, Dict
 
+import numpy as np
+
+from ml_data_collector import load_binary_log, LOG_LOCK, LABEL_KEEP, LABEL_CUT
+
 # Import ML Engine to trigger retraining
 try:
     from ml_engine import RoughCutModel
@@ -22,6 +27,7 @@ class FeedbackLoop:
     def __init__(self, data_dir: str = "training_data"):
         self.data_dir = data_dir
         self.log_file = os.path.join(data_dir, "rough_cut_decisions.jsonl")
+        self.bin_file = os.path.join(data_dir, "rough_cut_decisions.bin")
         
     
     def process_feedback(self, project_id: str, final_timeline: Dict):
@@ -44,55 +50,66 @@ class FeedbackLoop:
                 # We match this against the original segment's start/end.
                 kept_ranges.append((clip.get('trimStart', 0), clip.get('trimEnd', 0)))
 
-        # 2. Read Logs and Label
-        updated_lines = []
-        match_count = 0
+        # Ranges sorted by start, with the running max of their ends, so each
+        # record only visits the ranges that can overlap it (see _covered_duration)
+        sorted_ranges = self._merge_touching_ranges(sorted(kept_ranges, key=lambda r: r[0]))
+        range_starts = [k_start for k_start, _ in sorted_ranges]
+        max_ends = []
+        for _, k_end in sorted_ranges:
+            max_ends.append(max(k_end, max_ends[-1]) if max_ends else k_end)
+
+        # Collectors append under the same lock, so no decision is lost between read and replace
+        with LOG_LOCK:
+            # 2. Read Logs and Label
+            updated_lines = []
+            match_count = 0
         
-        with open(self.log_file, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+            with open(self.log_file, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
 
-        for line in lines:
-            try:
-                record = json.loads(line)
+            for line in lines:
+                try:
+                    record = json.loads(line)
                 
-                # Check for time overlap
-                seg_start = record.get('start')
-                seg_end = record.get('end')
+                    # Check for time overlap
+                    seg_start = record.get('start')
+                    seg_end = record.get('end')
                 
-                if seg_start is None or seg_end is None:
-                    # Fallback to text match if time missing (old logs)
-                    updated_lines.append(line)
-                    continue
+                    if seg_start is None or seg_end is None:
+                        # Fallback to text match if time missing (old logs)
+                        updated_lines.append(line)
+                        continue
                     
-                # Is this segment covered by any kept range?
-                # We consider it KEPT if at least 50% of it is covered.
-                seg_duration = seg_end - seg_start
-                covered_duration = 0
+                    # Is this segment covered by any kept range?
+                    # We consider it KEPT if at least 50% of it is covered.
+                    seg_duration = seg_end - seg_start
+                    covered_duration = self._covered_duration(
+                        seg_start, seg_end, sorted_ranges, range_starts, max_ends
+                    )
                 
-                for k_start, k_end in kept_ranges:
-                    # Calculate overlap
-                    overlap_start = max(seg_start, k_start)
-                    overlap_end = min(seg_end, k_end)
-                    overlap = max(0, overlap_end - overlap_start)
-                    covered_duration += overlap
+                    coverage_ratio = covered_duration / seg_duration if seg_duration > 0 else 0
                 
-                coverage_ratio = covered_duration / seg_duration if seg_duration > 0 else 0
-                
-                # Labeling Logic
-                if coverage_ratio > 0.5:
-                    record['user_final_decision'] = 'KEEP'
-                else:
-                    record['user_final_decision'] = 'CUT'
+                    # Labeling Logic
+                    if coverage_ratio > 0.5:
+                        record['user_final_decision'] = 'KEEP'
+                    else:
+                        record['user_final_decision'] = 'CUT'
                     
-                match_count += 1
-                updated_lines.append(json.dumps(record))
+                    match_count += 1
+                    updated_lines.append(json.dumps(record))
                 
-            except json.JSONDecodeError:
-                updated_lines.append(line)
+                except json.JSONDecodeError:
+                    updated_lines.append(line)
 
-        # 3. Write back
-        with open(self.log_file, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(updated_lines) + '\n')
+            # 3. Write back
+            # Replace the file rather than truncating it, so readers that track the
+            # log incrementally (MLScheduler) never see it half-written.
+            tmp_file = f"{self.log_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(updated_lines) + '\n')
+            os.replace(tmp_file, self.log_file)
+        
+            self._label_binary_log(sorted_ranges)
             
         if match_count > 0 and RoughCutModel:
             logger.info("Triggering ML Model Retraining...")
@@ -105,3 +122,62 @@ class FeedbackLoop:
 
         logger.info(f"Feedback Loop: Updated {match_count} records based on timeline overlap.")
         return { "success": True, "updated_count": match_count }
+
+    def _merge_touching_ranges(self, sorted_ranges: List[tuple]) -> List[tuple]:
+        """
+        Join ranges where one ends exactly where the next (by start) begins, e.g.
+        a clip split in two on the timeline. Their coverage of any segment adds
+        up to the joined range's, so labels are unchanged. Overlapping ranges are
+        left alone since each of them counts towards coverage.
+        """
+        merged = []
+        for k_start, k_end in sorted_ranges:
+            if merged and merged[-1][1] == k_start and merged[-1][0] <= k_start <= k_end:
+                merged[-1] = (merged[-1][0], k_end)
+            else:
+                merged.append((k_start, k_end))
+        return merged
+
+    def _covered_duration(self, seg_start: float, seg_end: float, sorted_ranges: List[tuple],
+                          range_starts: List[float], max_ends: List[float]) -> float:
+        """
+        Total overlap of [seg_start, seg_end] with the kept ranges (overlapping
+        ranges each count). Ranges starting at or after seg_end are cut off by
+        bisecting the starts, and those ending before seg_start by bisecting the
+        running max of the ends, so only candidates in between are summed.
+        """
+        lo = bisect.bisect_right(max_ends, seg_start)
+        hi = bisect.bisect_left(range_starts, seg_end)
+        covered_duration = 0
+        for k_start, k_end in sorted_ranges[lo:hi]:
+            # Calculate overlap
+            overlap_start = max(seg_start, k_start)
+            overlap_end = min(seg_end, k_end)
+            covered_duration += max(0, overlap_end - overlap_start)
+        return covered_duration
+
+    def _label_binary_log(self, kept_ranges: List[tuple]):
+        """
+        Apply the same 50% coverage rule to the binary decision log, in place.
+        Coverage is computed for all records at once against each kept range.
+        """
+        try:
+            records = load_binary_log(self.bin_file, mode='r+')
+            if records is None or len(records) == 0:
+                return
+                
+            starts, ends = records['start'], records['end']
+            covered = np.zeros(len(records), dtype=np.float64)
+            for k_start, k_end in kept_ranges:
+                covered += np.clip(np.minimum(ends, k_end) - np.maximum(starts, k_start), 0, None)
+                
+            durations = ends - starts
+            with np.errstate(invalid='ignore', divide='ignore'):
+                coverage_ratio = np.where(durations > 0, covered / durations, 0)
+                
+            # Old records without timing stay unlabeled, as in the JSONL log
+            has_time = np.isfinite(starts) & np.isfinite(ends)
+            records['user'][has_time] = np.where(coverage_ratio[has_time] > 0.5, LABEL_KEEP, LABEL_CUT)
+            records.flush()
+        except Exception as e:
+            logger.error(f"Failed to label binary decision log: {e}")
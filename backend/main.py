@@ -4,6 +4,8 @@ import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
@@ -21,6 +23,10 @@ from core.config import settings
 
 # Create tables and directories
 Base.metadata.create_all(bind=engine)
+# create_all skips existing tables, so add indexes introduced later explicitly
+for table in Base.metadata.sorted_tables:
+    for index in table.indexes:
+        index.create(bind=engine, checkfirst=True)
 os.makedirs(settings.data_dir, exist_ok=True)
 os.makedirs(settings.upload_dir, exist_ok=True)
 
@@ -55,7 +61,7 @@ async def lifespan(app: FastAPI):
         
     try:
         # Start ML Scheduler (checks every hour)
-        scheduler.start(interval_seconds=3600)
+        await scheduler.start(interval_seconds=3600)
     except Exception as e:
         logger.error(f"Failed to start ML scheduler: {e}")
         
@@ -65,7 +71,8 @@ async def lifespan(app: FastAPI):
     if scheduler:
         scheduler.stop()
 
-app = FastAPI(title=settings.app_title, lifespan=lifespan)
+# orjson encodes the large word/segment payloads much faster than stdlib json
+app = FastAPI(title=settings.app_title, lifespan=lifespan, default_response_class=ORJSONResponse)
 app.state.scheduler = scheduler
 app.state.transcription_progress = {}
 
@@ -85,6 +92,10 @@ app.add_middleware(
     expose_headers=["Content-Disposition"],
 )
 
+# Compress text payloads (transcripts, exports, JSON). Media range requests from
+# <video> elements ask for identity encoding, so seeking is unaffected.
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Include routers with authentication protection where needed
 app.include_router(system_router, prefix="/api")  # System routes like health checks
 app.include_router(auth_router, prefix="/api")    # Auth routes (login)
@@ -92,7 +103,7 @@ app.include_router(projects_router, prefix="/api", dependencies=[Depends(verify_
 app.include_router(transcripts_router, prefix="/api", dependencies=[Depends(verify_jwt_token)])
 app.include_router(editing_router, prefix="/api", dependencies=[Depends(verify_jwt_token)])
 
-# Serve static files from the uploads directory
+# Serve static files from the uploads directory (StaticFiles answers HTTP Range requests for seeking)
 app.mount("/uploads", StaticFiles(directory=str(settings.upload_dir)), name="uploads")
 
 # Note: Root, ml-status, and transcription-progress routes have been moved to api/system.py
@@ -10,24 +10,194 @@ Schema:
     "start": float,
     "end": float,
     "features": { ... extracted features ... },
+    "features_version": int,
     "heuristic_decision": "KEEP" | "CUT",
     "user_final_decision": "KEEP" | "CUT" (Added later via reconciliation)
 }
+
+Each decision is also appended to a fixed-width binary log (.bin) so training
+can load the feature matrix with a single np.fromfile instead of parsing JSON.
+The file starts with a 12-byte header (magic, FEATURES_VERSION, feature count),
+followed by DECISION_DTYPE records. Labels are updated in place by the feedback
+loop. When the feature schema changes, the old file is set aside and the log is
+rebuilt from the JSONL records.
 """
 
 import json
 import logging
 import os
+import struct
+import threading
+import weakref
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+import numpy as np
+import orjson
+
+from feature_extractor import FEATURE_NAMES, FEATURES_VERSION
 
 logger = logging.getLogger(__name__)
 
+# Held while appending to, or rewriting, the decision logs (see FeedbackLoop)
+LOG_LOCK = threading.Lock()
+
+BIN_MAGIC = b"RCDL"
+BIN_HEADER = struct.Struct("<4sII")  # magic, features version, number of features
+
+# Label encoding in the binary log
+LABEL_KEEP = 0
+LABEL_CUT = 1
+LABEL_NONE = 255  # Not labeled yet
+LABEL_CODES = {"KEEP": LABEL_KEEP, "CUT": LABEL_CUT}
+
+DECISION_DTYPE = np.dtype([
+    ('features', np.float32, (len(FEATURE_NAMES),)),
+    ('start', np.float64),
+    ('end', np.float64),
+    ('heuristic', np.uint8),
+    ('user', np.uint8),
+    ('segment_id', np.uint64),
+])
+
+
+def binary_log_version(path: str) -> Optional[int]:
+    """Features version recorded in a binary log header (None if missing or unreadable)."""
+    try:
+        with open(path, 'rb') as f:
+            magic, version, count = BIN_HEADER.unpack(f.read(BIN_HEADER.size))
+    except (OSError, struct.error):
+        return None
+    if magic != BIN_MAGIC or count != len(FEATURE_NAMES):
+        return None
+    return version
+
+
+def load_binary_log(path: str, mode: str = None) -> Optional[np.ndarray]:
+    """
+    Load the binary decision log as a structured array.
+    mode=None reads the file into memory; 'r+' returns a writable memmap.
+    Returns None if the file is missing or was written for a different feature schema.
+    """
+    if not os.path.exists(path):
+        return None
+        
+    if binary_log_version(path) != FEATURES_VERSION:
+        logger.warning(f"Ignoring binary decision log with incompatible features: {path}")
+        return None
+        
+    if mode is None:
+        return np.fromfile(path, dtype=DECISION_DTYPE, offset=BIN_HEADER.size)
+    if os.path.getsize(path) == BIN_HEADER.size:
+        return np.empty(0, dtype=DECISION_DTYPE)  # memmap cannot map zero records
+    return np.memmap(path, dtype=DECISION_DTYPE, mode=mode, offset=BIN_HEADER.size)
+
+
+def _segment_number(segment_id: str) -> int:
+    """'seg_123' -> 123 (0 if the id has no numeric suffix)."""
+    suffix = str(segment_id).rsplit('_', 1)[-1]
+    return int(suffix) if suffix.isdigit() else 0
+
+
+def _pack_decision(features: Dict[str, float], start, end, heuristic_decision, user_final_decision, segment_id) -> np.ndarray:
+    record = np.zeros(1, dtype=DECISION_DTYPE)
+    record['features'] = [features.get(name, 0.0) for name in FEATURE_NAMES]
+    record['start'] = np.nan if start is None else start
+    record['end'] = np.nan if end is None else end
+    record['heuristic'] = LABEL_CODES.get(heuristic_decision, LABEL_NONE)
+    record['user'] = LABEL_CODES.get(user_final_decision, LABEL_NONE)
+    record['segment_id'] = _segment_number(segment_id)
+    return record
+
+
+def _append_pending(log_file: str, bin_file: str, lines: list, records: list):
+    """
+    Write buffered decisions to both logs with one append each. The binary log
+    goes first; if either append fails, both files are cut back to their old
+    size so they keep holding the same decisions.
+    """
+    if not lines:
+        return
+    with LOG_LOCK:
+        bin_size = os.path.getsize(bin_file) if os.path.exists(bin_file) else None
+        log_size = os.path.getsize(log_file) if os.path.exists(log_file) else 0
+        try:
+            with open(bin_file, 'ab') as f:
+                f.write(b"".join(records))
+            with open(log_file, 'ab') as f:
+                f.write(b"".join(lines))
+        except Exception as e:
+            logger.error(f"Failed to log ML data: {e}")
+            _truncate(bin_file, bin_size)
+            _truncate(log_file, log_size)
+        finally:
+            lines.clear()
+            records.clear()
+
+
+def _truncate(path: str, size: Optional[int]):
+    """Cut a log back to size bytes (None: it did not exist before)."""
+    try:
+        if size is None:
+            os.remove(path)
+        elif os.path.exists(path) and os.path.getsize(path) > size:
+            os.truncate(path, size)
+    except OSError as e:
+        logger.error(f"Failed to roll back {path}: {e}")
+
+
 class MLDataCollector:
     def __init__(self, data_dir: str = "training_data"):
         self.data_dir = data_dir
         os.makedirs(data_dir, exist_ok=True)
         self.log_file = os.path.join(data_dir, "rough_cut_decisions.jsonl")
+        self.bin_file = os.path.join(data_dir, "rough_cut_decisions.bin")
+        
+        # Decisions are buffered and appended in batches (see flush)
+        self.flush_every = 256
+        self._pending_lines = []
+        self._pending_records = []
+        # Write out anything still buffered when the collector is dropped or at exit
+        weakref.finalize(self, _append_pending, self.log_file, self.bin_file,
+                         self._pending_lines, self._pending_records)
+        
+        if not os.path.exists(self.bin_file):
+            self._backfill_binary_log()
+        elif binary_log_version(self.bin_file) != FEATURES_VERSION:
+            # Feature schema changed: keep the old file aside and rebuild
+            stale_file = f"{self.bin_file}.stale"
+            os.replace(self.bin_file, stale_file)
+            logger.info(f"Binary decision log has an old feature schema, moved to {stale_file}")
+            self._backfill_binary_log()
+    
+    def _backfill_binary_log(self):
+        """Create the binary log, converting any decisions already in the JSONL log."""
+        records = []
+        if os.path.exists(self.log_file):
+            with open(self.log_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        # Vectors computed under another feature schema are not reused
+                        if entry.get('features_version', FEATURES_VERSION) != FEATURES_VERSION:
+                            continue
+                        records.append(_pack_decision(
+                            entry.get('features') or {}, entry.get('start'), entry.get('end'),
+                            entry.get('heuristic_decision'), entry.get('user_final_decision'),
+                            entry.get('segment_id', '')
+                        ))
+                    except Exception:
+                        continue
+        
+        try:
+            with open(self.bin_file, 'wb') as f:
+                f.write(BIN_HEADER.pack(BIN_MAGIC, FEATURES_VERSION, len(FEATURE_NAMES)))
+                if records:
+                    f.write(np.concatenate(records).tobytes())
+            if records:
+                logger.info(f"Converted {len(records)} logged decisions to {self.bin_file}")
+        except Exception as e:
+            logger.error(f"Failed to create binary decision log: {e}")
     
     def log_decision(self, 
                      project_id: str, 
@@ -49,15 +219,24 @@ class MLDataCollector:
             "end": end,
             "text_snippet": segment_text[:50], # Helpful for debugging
             "features": features,
+            "features_version": FEATURES_VERSION,
             "heuristic_decision": heuristic_decision,
             "user_final_decision": None # To be labeled later
         }
         
         try:
-            with open(self.log_file, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(entry) + "\n")
+            self._pending_lines.append(orjson.dumps(entry, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE))
+            self._pending_records.append(_pack_decision(features, start, end, heuristic_decision, None, segment_id).tobytes())
         except Exception as e:
             logger.error(f"Failed to log ML data: {e}")
+            return
+            
+        if len(self._pending_lines) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        """Append all buffered decisions to disk."""
+        _append_pending(self.log_file, self.bin_file, self._pending_lines, self._pending_records)
 
     def reconcile_decisions(self, project_id: str, final_timeline_segments: list):
         """
@@ -3,8 +3,9 @@ Machine Learning Engine for Rough Cut.
 
 Responsibilities:
 1. Feature Extraction: Uses FeatureExtractor to convert segments to vectors.
-2. Training: Trains a RandomForestClassifier on labeled data.
-3. Prediction: Returns probability of "CUT" for a new segment.
+2. Training: Trains a HistGradientBoostingClassifier on labeled data.
+3. Prediction: Returns probability of "CUT" for a new segment
+   (compiled to ONNX Runtime when skl2onnx/onnxruntime are installed).
 """
 
 import logging
@@ -13,48 +14,59 @@ import os
 
 # Suppress repetitive scikit-learn parallel processing warnings
 warnings.filterwarnings("ignore", category=UserWarning, module="sklearn")
-import json
 import joblib
-import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score, classification_report
-from feature_extractor import FeatureExtractor
+import orjson
+from threadpoolctl import threadpool_limits
+from feature_extractor import FeatureExtractor, FEATURE_NAMES, FEATURE_NAMES_V1, FEATURE_NAMES_V2
+from ml_data_collector import load_binary_log, LABEL_NONE
 
 logger = logging.getLogger(__name__)
 
+# Optional: ONNX Runtime for compiled, native-speed tree traversal
+# (skl2onnx is only needed to export, and is imported there)
+try:
+    import onnxruntime as ort
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+    logger.warning("onnxruntime not available. Predictions will use scikit-learn directly.")
+
+# LZ4 decompresses faster than zlib; joblib only supports it when lz4 is installed
+try:
+    import lz4  # noqa: F401
+    MODEL_COMPRESSION = ('lz4', 3)
+except ImportError:
+    MODEL_COMPRESSION = ('zlib', 3)
+
+# Physical cores: counting hyperthreads oversubscribes the tree builders
+try:
+    import psutil
+    PHYSICAL_CORES = psutil.cpu_count(logical=False) or os.cpu_count() or 1
+except ImportError:
+    PHYSICAL_CORES = os.cpu_count() or 1
+
+# An unlabeled JSONL record, as written by orjson (the collector) or json.dumps
+# (the feedback loop). String values are escaped, so these only match the real key.
+_UNLABELED_MARKERS = (b'"user_final_decision":null', b'"user_final_decision": null')
+
 class RoughCutModel:
-    def __init__(self, model_dir: str = "models"):
+    # Feature schema for newly trained models
+    FEATURE_NAMES = tuple(FEATURE_NAMES_V2)
+    
+    def __init__(self, model_dir: str = "models", feature_names: list = None):
         self.model_dir = model_dir
         os.makedirs(model_dir, exist_ok=True)
         self.model_path = os.path.join(model_dir, "rough_cut_model.pkl")
+        self.onnx_path = os.path.join(model_dir, "rough_cut_model.onnx")
         self.model = None
+        self.session = None  # ONNX Runtime session compiled from self.model (optional)
         self.extractor = FeatureExtractor()
         
-        # Updated feature names to match enhanced FeatureExtractor
-        # Total: 20 features (was 8)
-        self.feature_names = [
-            # Original timing features (5)
-            'duration', 'word_count', 'speech_rate', 
-            'pause_before', 'pause_after',
-            
-            # Original text features (4)
-            'stop_word_ratio', 'starts_with_repeat', 'has_filler', 'filler_count',
-            
-            # New linguistic complexity features (4)
-            'unique_word_ratio', 'avg_word_length', 
-            'question_count', 'exclamation_count',
-            
-            # New sentiment features (3)
-            'sentiment_positive', 'sentiment_negative', 'sentiment_subjectivity',
-            
-            # New contextual features (2)
-            'position_in_video', 'time_since_last_cut',
-            
-            # New audio features (4)
-            'avg_energy', 'energy_variance', 'avg_pitch', 'pitch_stability'
-        ]
+        # Schema used for training; self.feature_names follows the loaded model,
+        # which is saved together with the features it was trained on.
+        self.train_feature_names = list(feature_names or self.FEATURE_NAMES)
+        self.feature_names = list(self.train_feature_names)
         
         self.load_model()
 
@@ -66,50 +78,84 @@ class RoughCutModel:
         if not os.path.exists(training_data_path):
             logger.error(f"Training data not found: {training_data_path}")
             return
+            
+        self.feature_names = list(self.train_feature_names)
+
+        # Prefer the fixed-width binary log written alongside the JSONL
+        bin_path = os.path.splitext(training_data_path)[0] + ".bin"
+        records = load_binary_log(bin_path)
+        labeled = records[records['user'] != LABEL_NONE] if records is not None else None
+        if labeled is not None and len(labeled):
+            logger.info(f"Loaded {len(labeled)} labeled records from {bin_path}")
+            columns = [FEATURE_NAMES.index(name) for name in self.feature_names]
+            return self._fit(np.ascontiguousarray(labeled['features'][:, columns]), labeled['user'].astype(np.int8))
+        if labeled is not None:
+            # Labels may only be in the JSONL (e.g. written before the binary log existed)
+            logger.info(f"No labeled records in {bin_path}; reading {training_data_path}")
 
         logger.info("Loading training data...")
-        data = []
-        with open(training_data_path, 'r', encoding='utf-8') as f:
+        # Pass 1: size the arrays up front (one record per line at most)
+        with open(training_data_path, 'rb') as f:
+            max_records = sum(chunk.count(b'\n') for chunk in iter(lambda: f.read(1 << 20), b'')) + 1
+            
+        # Trees only compare values, so float32 is enough (and what sklearn uses internally)
+        X = np.empty((max_records, len(self.feature_names)), dtype=np.float32)
+        y = np.empty(max_records, dtype=np.int8)
+        n = 0
+        
+        # Pass 2: parse with orjson straight into the preallocated rows
+        with open(training_data_path, 'rb') as f:
             for line in f:
+                # Most records are unlabeled; reject them on the raw bytes without parsing
+                if any(marker in line for marker in _UNLABELED_MARKERS):
+                    continue
                 try:
-                    record = json.loads(line)
+                    record = orjson.loads(line)
                     # Only train on labeled data (where user made a decision)
-                    if record.get('user_final_decision'):
+                    decision = record.get('user_final_decision')
+                    if decision:
                         features = record['features']
-                        label = 1 if record['user_final_decision'] == 'CUT' else 0
-                        
-                        # Flatten features to list
-                        feature_vector = [features.get(name, 0.0) for name in self.feature_names]
-                        data.append(feature_vector + [label])
+                        X[n] = [features.get(name, 0.0) for name in self.feature_names]
+                        y[n] = 1 if decision == 'CUT' else 0
+                        n += 1
                 except Exception as e:
                     logger.warning(f"Skipping bad training record: {e}")
 
-        if not data:
+        if n == 0:
             logger.warning("No valid training data found.")
             return
 
-        # Create DataFrame
-        df = pd.DataFrame(data, columns=self.feature_names + ['label'])
+        X, y = X[:n], y[:n]
         
-        X = df[self.feature_names]
-        y = df['label']
+        return self._fit(X, y)
+
+    def _fit(self, X: np.ndarray, y: np.ndarray):
+        """Fit, evaluate and save the model. Returns the evaluation metrics."""
+        # scikit-learn is only needed for training; keep it off the import path
+        from sklearn.ensemble import HistGradientBoostingClassifier
+        from sklearn.model_selection import train_test_split
+        from sklearn.metrics import accuracy_score, classification_report
         
         # Train/Test Split
         X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
         
         # Initialize and Train with Enhanced Hyperparameters
         logger.info(f"Training on {len(X_train)} examples...")
-        self.model = RandomForestClassifier(
-            n_estimators=200,            # More trees = better accuracy (was 100)
-            max_depth=15,                # Prevent overfitting
-            min_samples_split=10,        # Require more samples to split nodes
-            min_samples_leaf=5,          # Smoother decision boundaries
-            max_features='sqrt',         # Feature randomness for diversity
+        # Histogram-based boosting: features are binned once, splits search 256 bins.
+        # Always a fresh model: fit() re-bins the features from the new data, so
+        # trees kept from a previous fit (warm_start) would split on stale bins.
+        self.model = HistGradientBoostingClassifier(
+            max_iter=200,                # Upper bound on boosting rounds
+            max_depth=8,                 # Prevent overfitting
+            learning_rate=0.05,
+            l2_regularization=0.1,       # Smoother leaf values
+            early_stopping=True,         # Stop once the validation score plateaus
             class_weight='balanced',     # Handle imbalanced KEEP/CUT data
-            random_state=42,
-            n_jobs=-1                    # Use all CPU cores for speed
+            random_state=42
         )
-        self.model.fit(X_train, y_train)
+        # One OpenMP thread per physical core; keep BLAS out of the way
+        with threadpool_limits(limits={'openmp': PHYSICAL_CORES, 'blas': 1}):
+            self.model.fit(X_train, y_train)
         
         # Evaluate with detailed metrics
         y_pred = self.model.predict(X_test)
@@ -131,28 +177,73 @@ class RoughCutModel:
             "support": report['CUT']['support']
         }
 
+    @property
+    def is_ready(self) -> bool:
+        """True when predictions can be served (scikit-learn model or ONNX session)."""
+        return self.model is not None or self.session is not None
+
     def predict(self, segment: dict, prev_segment: dict = None, next_segment: dict = None, audio_features: dict = None) -> float:
         """
         Predict probability that a segment should be CUT.
         Returns: float (0.0 to 1.0)
         """
-        if not self.model:
+        if not self.is_ready:
             return 0.0 # Default to KEEP if no model
             
         features = self.extractor.extract_features(segment, prev_segment, next_segment, audio_features)
         feature_vector = [features.get(name, 0.0) for name in self.feature_names]
         
         # Reshape for single prediction
-        X = np.array(feature_vector).reshape(1, -1)
+        X = np.array(feature_vector, dtype=np.float32).reshape(1, -1)
         
         # Get probability of class 1 (CUT)
-        prob_cut = self.model.predict_proba(X)[0][1]
+        prob_cut = self._predict_proba(X)[0]
         
         return float(prob_cut)
 
+    def predict_batch(self, segments: list, prev_segments: list, next_segments: list, audio_features: list = None) -> np.ndarray:
+        """
+        Predict CUT probabilities for many segments with a single predict_proba call.
+        prev_segments / next_segments / audio_features are parallel to segments (None entries allowed).
+        Returns: float array (0.0 to 1.0) of length len(segments)
+        """
+        if not self.is_ready or not segments:
+            return np.zeros(len(segments), dtype=np.float64) # Default to KEEP if no model
+            
+        if audio_features is None:
+            audio_features = [None] * len(segments)
+            
+        # Stack all feature vectors into one (M, N) matrix
+        X = np.empty((len(segments), len(self.feature_names)), dtype=np.float32)
+        for row, (segment, prev_segment, next_segment, audio) in enumerate(zip(segments, prev_segments, next_segments, audio_features)):
+            features = self.extractor.extract_features(segment, prev_segment, next_segment, audio)
+            X[row] = [features.get(name, 0.0) for name in self.feature_names]
+        
+        # Probability of class 1 (CUT) for every row
+        return self._predict_proba(X)
+
+    def _predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """CUT probabilities for a float32 feature matrix, via ONNX Runtime when compiled."""
+        if self.session is not None:
+            try:
+                # Outputs: [label, probabilities] (zipmap disabled at export)
+                return self.session.run(None, {self.session.get_inputs()[0].name: X})[1][:, 1]
+            except Exception as e:
+                if self.model is None:
+                    logger.warning(f"ONNX inference failed and no scikit-learn model is loaded: {e}")
+                    return np.zeros(len(X), dtype=np.float64)
+                logger.warning(f"ONNX inference failed, falling back to scikit-learn: {e}")
+                self.session = None
+        # No threadpool_limits here: entering it costs milliseconds, far more than
+        # a prediction; the thread limits are applied around fit() only
+        return self.model.predict_proba(X)[:, 1]
+
     def save_model(self):
         import hashlib
-        joblib.dump(self.model, self.model_path)
+        # Protocol 5 pickles the trees' numpy arrays out-of-band (fewer copies on load)
+        # The feature schema travels with the model so load_model can restore it
+        artifact = {'model': self.model, 'features': list(self.feature_names)}
+        joblib.dump(artifact, self.model_path, compress=MODEL_COMPRESSION, protocol=5)
         logger.info(f"Model saved to {self.model_path}")
         
         # Security: Create a hash of the newly saved model
@@ -162,6 +253,79 @@ class RoughCutModel:
             with open(hash_path, "w") as f:
                 f.write(model_hash)
             logger.info(f"Model hash saved to {hash_path}")
+            
+            self._export_onnx(model_hash)
+
+    def _export_onnx(self, model_hash: str):
+        """
+        Compile the trained forest to ONNX so predictions run in ONNX Runtime's
+        native tree ensemble kernel. The pickle's hash is stored in the ONNX
+        metadata so a stale export is never paired with a newer model, along
+        with the feature schema so the export can be served on its own when the
+        pickle cannot be loaded (e.g. after a Python or scikit-learn upgrade).
+        """
+        self.session = None  # Never keep serving a session compiled from the previous model
+        if not ONNX_AVAILABLE or self.model is None:
+            return
+            
+        try:
+            from skl2onnx import to_onnx
+        except ImportError:
+            logger.info("skl2onnx not installed; skipping ONNX export.")
+            return
+            
+        try:
+            sample = np.zeros((1, len(self.feature_names)), dtype=np.float32)
+            onx = to_onnx(self.model, sample, options={id(self.model): {'zipmap': False}})
+            meta = onx.metadata_props.add()
+            meta.key, meta.value = "source_sha256", model_hash
+            meta = onx.metadata_props.add()
+            meta.key, meta.value = "features", orjson.dumps(list(self.feature_names)).decode()
+            
+            # Write atomically so concurrent loaders never see a partial file
+            tmp_path = f"{self.onnx_path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(onx.SerializeToString())
+            os.replace(tmp_path, self.onnx_path)
+            logger.info(f"ONNX model saved to {self.onnx_path}")
+        except Exception as e:
+            logger.warning(f"Failed to export ONNX model: {str(e)[:200]}")  # Converter errors dump the whole graph
+            return
+            
+        self._load_onnx(model_hash)
+
+    def _load_onnx(self, model_hash: str, restore_features: bool = False) -> bool:
+        """
+        Open an ONNX Runtime session if the export matches the verified pickle.
+        restore_features=True also takes the feature schema from the export
+        (used when the pickle itself could not be loaded).
+        """
+        if not ONNX_AVAILABLE or not os.path.exists(self.onnx_path):
+            return False
+            
+        try:
+            options = ort.SessionOptions()
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            session = ort.InferenceSession(self.onnx_path, options, providers=["CPUExecutionProvider"])
+            
+            metadata = session.get_modelmeta().custom_metadata_map
+            if metadata.get("source_sha256") != model_hash:
+                logger.info("ONNX model is stale; it will be re-exported.")
+                return False
+                
+            if restore_features:
+                feature_names = orjson.loads(metadata.get("features", "[]"))
+                if not feature_names or any(name not in FEATURE_NAMES for name in feature_names):
+                    logger.warning("ONNX model does not record a known feature schema.")
+                    return False
+                self.feature_names = feature_names
+                
+            self.session = session
+            logger.info("Loaded ONNX Runtime predictor.")
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to load ONNX model: {e}")
+            return False
 
     def _calculate_file_hash(self, filepath: str) -> str:
         """Calculate SHA-256 hash of a file."""
@@ -202,9 +366,45 @@ class RoughCutModel:
                 return
                 
             try:
-                self.model = joblib.load(self.model_path)
-                logger.info("Loaded and verified specialized rough cut model.")
+                artifact = joblib.load(self.model_path)
             except Exception as e:
                 logger.error(f"Failed to load model: {e}")
+                # The ONNX export does not depend on the Python/scikit-learn version that pickled the model
+                if self._load_onnx(expected_hash, restore_features=True):
+                    logger.info(f"Serving the rough cut model from {self.onnx_path} ({len(self.feature_names)} features).")
+                else:
+                    logger.info("Running in heuristic-only mode.")
+                return
+                
+            if isinstance(artifact, dict):
+                model, feature_names = artifact.get('model'), list(artifact.get('features') or [])
+            else:
+                # Older artifacts are a bare estimator
+                model, feature_names = artifact, self._legacy_feature_names(artifact)
+                
+            if not feature_names or any(name not in FEATURE_NAMES for name in feature_names):
+                logger.error(f"Model was trained on an unknown feature schema: {feature_names}")
+                logger.info("Running in heuristic-only mode.")
+                return
+                
+            self.model = model
+            self.feature_names = feature_names
+            if hasattr(self.model, 'n_jobs'):
+                self.model.n_jobs = PHYSICAL_CORES  # Older RandomForest models were saved with n_jobs=-1
+            logger.info(f"Loaded and verified specialized rough cut model ({len(feature_names)} features).")
+                
+            # Compile once for models trained before the ONNX export existed
+            if not self._load_onnx(expected_hash):
+                self._export_onnx(expected_hash)
         else:
             logger.info("No trained model found. Running in heuristic-only mode.")
+
+    def _legacy_feature_names(self, model) -> list:
+        """Infer the feature schema of a bare estimator saved before schemas were embedded."""
+        names = getattr(model, 'feature_names_in_', None)
+        if names is not None:
+            return [str(name) for name in names]
+        return {
+            len(FEATURE_NAMES_V1): list(FEATURE_NAMES_V1),
+            len(FEATURE_NAMES_V2): list(FEATURE_NAMES_V2),
+        }.get(getattr(model, 'n_features_in_', 0), [])
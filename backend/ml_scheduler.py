@@ -1,14 +1,34 @@
 import os
+import re
 import json
+import mmap
+import asyncio
 import logging
-import threading
+import multiprocessing
 import time
-from typing import Dict
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional
 
 from ml_engine import RoughCutModel
 
 logger = logging.getLogger(__name__)
 
+# A labeled record, as written by json.dumps (": ") or compact encoders (":").
+# String values are escaped, so this can only match the real key.
+_LABELED_RECORD = re.compile(rb'"user_final_decision": ?"(?:KEEP|CUT)"')
+
+# Bytes just before the scan offset whose CRC tells an append from a rewrite
+_TAIL_CHECK_BYTES = 4096
+
+
+def _train_in_worker(data_file: str, state_file: str, labeled_count: int):
+    """Worker-process entry point: retrain and record the new state."""
+    logging.basicConfig(level=logging.INFO)  # Spawned processes start without the app's logging setup
+    MLScheduler(data_file=data_file, state_file=state_file)._train(labeled_count)
+
+
 class MLScheduler:
     def __init__(self, data_file: str = "training_data/rough_cut_decisions.jsonl", state_file: str = "training_data/ml_state.json"):
         self.data_file = data_file
@@ -17,55 +37,77 @@ class MLScheduler:
         self.new_samples_threshold = 20
         self.model = RoughCutModel() # Load existing model structure
         self.is_running = False
+        self._task = None
+        self._pool = None
         
         # Ensure state file exists
         if not os.path.exists(self.state_file):
             self._save_state({"last_trained_count": 0, "last_trained_timestamp": None})
 
-    def start(self, interval_seconds: int = 3600):
-        """Start the scheduler in a background thread."""
+    async def start(self, interval_seconds: int = 3600):
+        """Start the scheduler as a task on the running event loop."""
         if self.is_running:
             return
             
         self.is_running = True
-        thread = threading.Thread(target=self._loop, args=(interval_seconds,), daemon=True)
-        thread.start()
+        self._task = asyncio.create_task(self._loop(interval_seconds))
         logger.info(f"ML Scheduler started. Checking every {interval_seconds} seconds.")
 
-    def _loop(self, interval: int):
+    def _new_pool(self) -> ProcessPoolExecutor:
+        # A fresh spawned process per training run: no GIL sharing with request
+        # handling, no forked server threads, and sklearn's memory is released
+        # when the process exits.
+        return ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"), max_tasks_per_child=1)
+
+    async def _loop(self, interval: int):
+        loop = asyncio.get_running_loop()
+        self._pool = self._new_pool()
         while self.is_running:
             try:
-                self.check_and_train()
+                # The check is a stat (plus a scan of appended bytes); keep it off the loop anyway
+                labeled_count = await asyncio.to_thread(self._due_for_training)
+                if labeled_count is not None:
+                    await loop.run_in_executor(self._pool, _train_in_worker, self.data_file, self.state_file, labeled_count)
+            except BrokenProcessPool as e:
+                logger.error(f"ML training worker died: {e}")
+                self._pool = self._new_pool()
             except Exception as e:
                 logger.error(f"Error in ML Scheduler loop: {e}")
             
-            time.sleep(interval)
+            await asyncio.sleep(interval)
 
     def stop(self):
         self.is_running = False
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        if self._pool:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
 
     def check_and_train(self):
         """Check if we have enough new data to retrain."""
+        labeled_count = self._due_for_training()
+        if labeled_count is not None:
+            self._train(labeled_count)
+
+    def _due_for_training(self) -> Optional[int]:
+        """Return the labeled sample count if a retrain is due, else None."""
         if not os.path.exists(self.data_file):
-            return
+            return None
 
         # 1. Count labeled samples
-        labeled_count = 0
+        state = self._load_state()
+        previous_state = dict(state)
         try:
-            with open(self.data_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    try:
-                        record = json.loads(line)
-                        if record.get('user_final_decision'):
-                            labeled_count += 1
-                    except json.JSONDecodeError:
-                        continue
+            labeled_count = self._count_labeled(state)
         except Exception as e:
             logger.error(f"Failed to read training data: {e}")
-            return
+            return None
+        if state != previous_state:
+            self._save_state(state)
 
         # 2. Check state
-        state = self._load_state()
         last_count = state.get("last_trained_count", 0)
 
         logger.info(f"ML Scehduler: Found {labeled_count} labeled samples (Last trained at: {last_count})")
@@ -75,9 +117,53 @@ class MLScheduler:
         # - Must have enough NEW samples since last time (e.g. +20)
         if labeled_count >= self.min_samples_to_train and (labeled_count - last_count) >= self.new_samples_threshold:
             logger.info("Triggering automatic model retraining...")
-            self._train(labeled_count)
-        else:
-            logger.info("Not enough new data to retrain yet.")
+            return labeled_count
+        
+        logger.info("Not enough new data to retrain yet.")
+        return None
+
+    def _count_labeled(self, state: Dict) -> int:
+        """
+        Count labeled records by scanning raw bytes instead of parsing JSON.
+        The scan position is kept in `state`, so only bytes appended since the
+        last check are scanned, and an unchanged file is not opened at all. A
+        file that was rewritten (new inode, shorter than the last offset, or a
+        different last _TAIL_CHECK_BYTES before it) is rescanned from the start.
+        """
+        st = os.stat(self.data_file)
+        offset = state.get("last_scanned_offset", 0)
+        count = state.get("scanned_labeled_count", 0)
+        
+        # Unchanged since the last scan (same inode, mtime and size): nothing to read
+        fingerprint = [st.st_ino, st.st_mtime_ns, st.st_size]
+        if state.get("fingerprint") == fingerprint:
+            return count
+            
+        if state.get("scanned_inode") != st.st_ino or st.st_size < offset:
+            offset, count = 0, 0
+            
+        tail_crc = 0
+        if st.st_size:
+            with open(self.data_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # os.replace frees the old inode, so a later rewrite can get the same
+                # number back: the last bytes scanned must still be the same ones
+                if offset and zlib.crc32(mm[max(0, offset - _TAIL_CHECK_BYTES):offset]) != state.get("scanned_tail_crc", 0):
+                    offset, count = 0, 0
+                # Stop at the last complete line; a record still being written is picked up next time
+                end = mm.rfind(b'\n', offset) + 1
+                if end > offset:
+                    count += sum(1 for _ in _LABELED_RECORD.finditer(mm, offset, end))
+                    offset = end
+                tail_crc = zlib.crc32(mm[max(0, offset - _TAIL_CHECK_BYTES):offset])
+                    
+        state.update({
+            "fingerprint": fingerprint,
+            "scanned_inode": st.st_ino,
+            "last_scanned_offset": offset,
+            "scanned_tail_crc": tail_crc,
+            "scanned_labeled_count": count
+        })
+        return count
 
     def _train(self, current_count: int):
         try:
@@ -85,11 +171,13 @@ class MLScheduler:
             metrics = self.model.train(self.data_file)
             
             # Update state
-            self._save_state({
+            state = self._load_state()
+            state.update({
                 "last_trained_count": current_count,
                 "last_trained_timestamp": time.time(),
                 "latest_metrics": metrics
             })
+            self._save_state(state)
             
             logger.info(f"Automatic retraining complete. Accuracy: {metrics.get('accuracy', 'N/A')}")
             
@@ -0,0 +1,101 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+import feedback_loop
+from feedback_loop import FeedbackLoop
+from feature_extractor import FEATURE_NAMES
+from ml_data_collector import MLDataCollector, load_binary_log, LABEL_KEEP, LABEL_CUT, LABEL_NONE
+from ml_engine import RoughCutModel
+
+
+def log_segments(collector, spans):
+    """Log one KEEP decision per (start, end) span, with the start as its duration feature."""
+    for i, (start, end) in enumerate(spans):
+        collector.log_decision(
+            project_id="p", segment_id=f"seg_{i}", start=start, end=end,
+            features={"duration": end - start, "pause_before": float(i)},
+            heuristic_decision="KEEP", segment_text=f"segment {i}",
+        )
+    collector.flush()
+
+
+def read_jsonl(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_log_label_and_load_round_trip(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(feedback_loop, "RoughCutModel", None)  # Labeling only, no retrain
+    data_dir = str(tmp_path / "training_data")
+
+    collector = MLDataCollector(data_dir)
+    log_segments(collector, [(0.0, 1.0), (1.0, 2.0), (2.0, 3.0)])
+
+    records = load_binary_log(collector.bin_file)
+    assert len(records) == 3
+    assert (records['user'] == LABEL_NONE).all()
+    assert records['features'][2, FEATURE_NAMES.index('pause_before')] == 2.0
+
+    # The user kept the first and last segment (the middle one is only 20% covered)
+    timeline = {'tracks': [{'id': 'v1', 'clips': [
+        {'trimStart': 0.0, 'trimEnd': 1.2},
+        {'trimStart': 2.0, 'trimEnd': 3.0},
+    ]}]}
+    result = FeedbackLoop(data_dir).process_feedback("p", timeline)
+    assert result == {"success": True, "updated_count": 3}
+
+    assert [r['user_final_decision'] for r in read_jsonl(collector.log_file)] == ['KEEP', 'CUT', 'KEEP']
+    records = load_binary_log(collector.bin_file)
+    assert records['user'].tolist() == [LABEL_KEEP, LABEL_CUT, LABEL_KEEP]
+    assert records['start'].tolist() == [0.0, 1.0, 2.0]
+
+
+def test_binary_log_is_backfilled_from_jsonl(tmp_path):
+    data_dir = str(tmp_path / "training_data")
+    collector = MLDataCollector(data_dir)
+    log_segments(collector, [(0.0, 1.0), (1.0, 2.0)])
+    os.remove(collector.bin_file)
+
+    rebuilt = load_binary_log(MLDataCollector(data_dir).bin_file)
+    assert rebuilt['start'].tolist() == [0.0, 1.0]
+    assert rebuilt['segment_id'].tolist() == [0, 1]
+
+
+@pytest.mark.parametrize("failing", ["log_file", "bin_file"])
+def test_failed_append_keeps_logs_in_step(tmp_path, failing):
+    collector = MLDataCollector(str(tmp_path / "training_data"))
+    log_segments(collector, [(0.0, 1.0)])
+    log_file, bin_file = collector.log_file, collector.bin_file
+    sizes = os.path.getsize(log_file), os.path.getsize(bin_file)
+
+    # One of the two appends fails (its path is a directory)
+    broken = str(tmp_path / "not_a_file")
+    os.makedirs(broken)
+    setattr(collector, failing, broken)
+    log_segments(collector, [(1.0, 2.0)])
+
+    assert (os.path.getsize(log_file), os.path.getsize(bin_file)) == sizes
+
+
+def test_train_reads_jsonl_labels_when_binary_log_has_none(tmp_path):
+    data_dir = str(tmp_path / "training_data")
+    collector = MLDataCollector(data_dir)
+    log_segments(collector, [(i, i + 0.5 + (i % 2)) for i in range(80)])
+
+    # Labels that only reached the JSONL
+    entries = read_jsonl(collector.log_file)
+    with open(collector.log_file, "w") as f:
+        for entry in entries:
+            entry['user_final_decision'] = 'CUT' if entry['features']['duration'] > 1.0 else 'KEEP'
+            f.write(json.dumps(entry) + "\n")
+    assert (load_binary_log(collector.bin_file)['user'] == LABEL_NONE).all()
+
+    model = RoughCutModel(model_dir=str(tmp_path / "models"))
+    metrics = model.train(collector.log_file)
+    assert metrics is not None and metrics['accuracy'] == 1.0
+    assert model.is_ready
+    assert np.isfinite(model._predict_proba(np.zeros((1, len(model.feature_names)), dtype=np.float32))).all()
@@ -0,0 +1,65 @@
+import json
+import os
+
+import numpy as np
+
+from ml_engine import RoughCutModel
+
+
+def make_records(rng, count, pause_scale):
+    """Labeled decisions where a segment is CUT when its pause before is long."""
+    records = []
+    for _ in range(count):
+        pause = float(rng.uniform(0, pause_scale))
+        records.append({
+            "features": {
+                "duration": float(rng.uniform(0.5, 5.0)),
+                "word_count": int(rng.integers(2, 20)),
+                "pause_before": round(pause, 3),
+                "stop_word_ratio": float(rng.uniform(0, 0.6)),
+            },
+            "user_final_decision": "CUT" if pause > pause_scale / 2 else "KEEP",
+        })
+    return records
+
+
+def write_log(path, records):
+    with open(path, "w") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+def feature_matrix(model, records):
+    return np.array(
+        [[r["features"].get(name, 0.0) for name in model.feature_names] for r in records],
+        dtype=np.float32,
+    )
+
+
+def test_retrain_on_shifted_data_predicts_held_out(tmp_path):
+    rng = np.random.default_rng(0)
+    log_file = str(tmp_path / "rough_cut_decisions.jsonl")
+
+    # First model: pauses up to 2s
+    write_log(log_file, make_records(rng, 400, 2.0))
+    RoughCutModel(model_dir=str(tmp_path / "models")).train(log_file)
+
+    # Retrain on a different range (pauses up to 10s), loading the saved model
+    # first as the scheduler's worker does
+    shifted = make_records(rng, 600, 10.0)
+    write_log(log_file, shifted)
+    retrained = RoughCutModel(model_dir=str(tmp_path / "models"))
+    assert retrained.is_ready
+    retrained.train(log_file)
+
+    held_out = make_records(rng, 300, 10.0)
+    X = feature_matrix(retrained, held_out)
+    y = np.array([r["user_final_decision"] == "CUT" for r in held_out])
+    accuracy = float(((retrained._predict_proba(X) > 0.5) == y).mean())
+    assert accuracy > 0.95
+
+    # Nothing from the first model carries over into the retrained one
+    fresh = RoughCutModel(model_dir=str(tmp_path / "fresh"))
+    fresh.train(log_file)
+    np.testing.assert_allclose(fresh.model.predict_proba(X), retrained.model.predict_proba(X))
+    assert os.path.exists(os.path.join(str(tmp_path / "models"), "rough_cut_model.pkl"))
@@ -0,0 +1,110 @@
+import json
+import os
+
+import feedback_loop
+import ml_scheduler
+from feedback_loop import FeedbackLoop
+from ml_data_collector import MLDataCollector
+from ml_scheduler import MLScheduler
+
+
+def labeled_in(path):
+    """The labeled count by parsing every record, as the scheduler used to."""
+    with open(path) as f:
+        return sum(json.loads(line).get('user_final_decision') in ('KEEP', 'CUT') for line in f)
+
+
+def make_scheduler(tmp_path, data_file):
+    return MLScheduler(data_file=data_file, state_file=str(tmp_path / "ml_state.json"))
+
+
+def test_count_resumes_after_appends(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    data_file = str(tmp_path / "rough_cut_decisions.jsonl")
+    records = [{"start": float(i), "user_final_decision": label} for i, label in enumerate(["KEEP", None, "CUT"])]
+    with open(data_file, "w") as f:
+        f.write("".join(json.dumps(r) + "\n" for r in records))
+        f.write('{"start": 3.0, "user_final_decision": "KE')  # Still being written
+    scheduler, state = make_scheduler(tmp_path, data_file), {}
+
+    assert scheduler._count_labeled(state) == 2
+    assert state["last_scanned_offset"] == os.path.getsize(data_file) - len('{"start": 3.0, "user_final_decision": "KE')
+
+    with open(data_file, "a") as f:
+        f.write('EP"}\n{"start":4.0,"user_final_decision":"CUT"}\n{"start": 5.0}\n')
+    assert scheduler._count_labeled(state) == 4
+    assert state["last_scanned_offset"] == os.path.getsize(data_file)
+
+
+
+def test_count_from_state_saved_before_tail_check(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    data_file = str(tmp_path / "rough_cut_decisions.jsonl")
+    with open(data_file, "w") as f:
+        f.write('{"user_final_decision": "KEEP"}\n{"user_final_decision": null}\n')
+    scheduler, ino = make_scheduler(tmp_path, data_file), os.stat(data_file).st_ino
+
+    # Nothing scanned yet, or a scan whose tail cannot be checked: counted from the start
+    state = {"scanned_inode": ino, "last_scanned_offset": 0, "scanned_labeled_count": 0}
+    assert scheduler._count_labeled(state) == 1
+    assert scheduler._count_labeled(state) == 1
+    state = {"scanned_inode": ino, "last_scanned_offset": 32, "scanned_labeled_count": 5}
+    assert scheduler._count_labeled(state) == 1
+
+def test_count_follows_feedback_rewrites(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(feedback_loop, "RoughCutModel", None)  # Labeling only, no retrain
+    data_dir = str(tmp_path / "training_data")
+    collector = MLDataCollector(data_dir)
+    scheduler, state = make_scheduler(tmp_path, collector.log_file), {}
+
+    def log_segments(start, count):
+        for i in range(start, start + count):
+            collector.log_decision(project_id="p", segment_id=f"seg_{i}", start=float(i), end=i + 1.0,
+                                   features={"duration": 1.0}, heuristic_decision="KEEP", segment_text=f"segment {i}")
+        collector.flush()
+
+    def give_feedback(*kept):
+        timeline = {'tracks': [{'id': 'v1', 'clips': [{'trimStart': s, 'trimEnd': e} for s, e in kept]}]}
+        FeedbackLoop(data_dir).process_feedback("p", timeline)
+
+    log_segments(0, 10)
+    assert scheduler._count_labeled(state) == 0
+
+    # Labels are written to a new file that replaces the log
+    give_feedback((0.0, 5.0))
+    assert scheduler._count_labeled(state) == labeled_in(collector.log_file) == 10
+
+    # New decisions are appended, then two rewrites happen between checks: the
+    # second temp file can be given the inode the scheduler last saw
+    log_segments(10, 5)
+    assert scheduler._count_labeled(state) == 10
+    give_feedback((0.0, 12.0))
+    log_segments(15, 5)
+    give_feedback((0.0, 20.0))
+    assert scheduler._count_labeled(state) == labeled_in(collector.log_file) == 20
+
+    # A fresh state (e.g. a lost state file) counts the same
+    assert scheduler._count_labeled({}) == 20
+
+
+def test_unchanged_log_is_not_read_again(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    data_file = str(tmp_path / "rough_cut_decisions.jsonl")
+    with open(data_file, "w") as f:
+        f.write('{"user_final_decision": "KEEP"}\n{"user_final_decision": "CUT"}\n')
+    scheduler, state = make_scheduler(tmp_path, data_file), {}
+    assert scheduler._count_labeled(state) == 2
+
+    def no_open(*args, **kwargs):
+        raise AssertionError("the log was opened")
+    monkeypatch.setattr(ml_scheduler, "open", no_open, raising=False)
+    assert scheduler._count_labeled(state) == 2
+    monkeypatch.delattr(ml_scheduler, "open")
+
+    # Same inode and size, edited in place: the fingerprint's mtime moves on
+    with open(data_file, "r+") as f:
+        f.write('{"user_final_decision": "keep"}')
+    st = os.stat(data_file)
+    os.utime(data_file, ns=(st.st_atime_ns, max(st.st_mtime_ns, state["fingerprint"][1] + 1)))
+    assert scheduler._count_labeled(state) == 1
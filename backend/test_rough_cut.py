@@ -0,0 +1,168 @@
+import re
+
+import pytest
+
+from core.rough_cut import ProfessionalRoughCutV2, _CharFilter
+
+
+@pytest.fixture(autouse=True)
+def in_tmp_path(tmp_path, monkeypatch):
+    # The rough cut opens its decision log and model relative to the working directory
+    monkeypatch.chdir(tmp_path)
+
+
+SIMILAR_PAIRS = [
+    ("we need to talk about the project today", "we need to talk about the project today"),
+    ("we need to talk about the project today", "so we need to talk about this project today"),
+    ("the quick brown fox jumps over the lazy dog", "the quick brown fox jumped over a lazy dog"),
+    ("apples oranges bananas", "oranges apples bananas"),
+    ("really great milk bread eggs", "bread eggs really great milk"),
+    ("I went to the store.", "I went to the store and bought milk."),
+    ("this is great", "this is great"),
+    ("very very happy", "happy"),
+]
+
+
+def test_similarity_prefilter_never_rejects_a_match():
+    rough_cut = ProfessionalRoughCutV2([])
+    for text1, text2 in SIMILAR_PAIRS:
+        for a, b in ((text1, text2), (text2, text1)):
+            tokens1, tokens2 = rough_cut._similarity_tokens(a), rough_cut._similarity_tokens(b)
+            score = rough_cut._similarity_from_tokens(tokens1, tokens2)
+            for threshold in (0.5, 0.85, 0.9, 0.95):
+                if score > threshold:
+                    assert rough_cut._may_exceed_similarity(tokens1, tokens2, threshold), (a, b, threshold)
+                assert rough_cut._similarity_exceeds(a, b, threshold) == (score > threshold)
+
+
+def make_words(text, gaps=None, deleted=()):
+    """
+    Word dicts for text: each word lasts 0.3s and starts 0.1s after the previous
+    one ends, or gaps[i] seconds for the word at index i.
+    """
+    words, t = [], 0.0
+    for i, word in enumerate(text.split()):
+        t += (gaps or {}).get(i, 0.1) if i else 0.0
+        words.append({'word': word, 'start': round(t, 3), 'end': round(t + 0.3, 3), 'isDeleted': i in deleted})
+        t += 0.3
+    return words
+
+
+def make_segment(rough_cut, indices, text=None):
+    """Segment over word indices, as the earlier passes build them."""
+    return {
+        'word_indices': list(indices),
+        'start_time': rough_cut._start_times[indices[0]] if indices else 0.0,
+        'end_time': rough_cut._end_times[indices[-1]] if indices else 0.0,
+        'text': rough_cut._join_words(indices) if text is None else text,
+    }
+
+
+def spans(segments):
+    return [(seg['word_indices'], seg['text']) for seg in segments]
+
+
+def test_refine_splits_on_sentence_ends_and_gaps_within_segments():
+    # A 0.6s gap before "am", and a 1s gap between the two segments
+    rough_cut = ProfessionalRoughCutV2(make_words("Hello there. How are you I am fine.", gaps={5: 1.0, 6: 0.6}))
+    segments = [make_segment(rough_cut, range(0, 5)), make_segment(rough_cut, range(5, 8)), make_segment(rough_cut, [])]
+
+    refined = rough_cut._refine_segmentation(segments)
+
+    # Nothing is split across the segment boundary, and the final "." adds no empty piece
+    assert spans(refined) == [
+        ([0, 1], "Hello there."),
+        ([2, 3, 4], "How are you"),
+        ([5], "I"),
+        ([6, 7], "am fine."),
+    ]
+    assert [(seg['start_time'], seg['end_time']) for seg in refined] == [(0.0, 0.7), (0.8, 1.9), (2.9, 3.2), (3.8, 4.5)]
+
+
+def test_refine_keeps_unsplit_segments_and_splits_at_removed_words():
+    rough_cut = ProfessionalRoughCutV2(make_words("so we we went home"))
+    # Index 2 was removed by an earlier pass: "we" and "went" are 0.5s apart
+    segments = [make_segment(rough_cut, [0, 1]), make_segment(rough_cut, [0, 1, 3, 4])]
+
+    refined = rough_cut._refine_segmentation(segments)
+
+    assert spans(refined) == [([0, 1], "so we"), ([0, 1], "so we"), ([3, 4], "went home")]
+
+
+def test_refine_rebuilds_text_of_unsplit_segments_with_deleted_words():
+    rough_cut = ProfessionalRoughCutV2(make_words("one two three four.", deleted={1}))
+    # Segment text leaves deleted words out; refined segments are joined from all their words
+    segments = [make_segment(rough_cut, [0, 1], text="one"), make_segment(rough_cut, [2, 3])]
+
+    assert spans(rough_cut._refine_segmentation(segments)) == [([0, 1], "one two"), ([2, 3], "three four.")]
+
+
+def repetition_segments(*texts):
+    """One segment per text, a second apart; word_indices only set the word count."""
+    segments, t = [], 0.0
+    for text in texts:
+        count = len(text.split())
+        segments.append({'word_indices': list(range(count)), 'text': text, 'start_time': t, 'end_time': t + count * 0.4})
+        t += count * 0.4 + 1.0
+    return segments
+
+
+def test_short_repetitions_need_the_same_keywords():
+    rough_cut = ProfessionalRoughCutV2([])
+    kept = lambda *texts: [seg['text'] for seg in rough_cut._remove_repetitions(repetition_segments(*texts))]
+
+    # Same keywords in any order, case or punctuation: the earlier take goes
+    assert kept("Great idea", "great idea!") == ["great idea!"]
+    assert kept("great idea", "idea, great") == ["idea, great"]
+    assert kept("the end", "The end.") == ["The end."]
+    # Different keywords, or none at all ("oh no" only has short words)
+    assert kept("great idea", "great idea today") == ["great idea", "great idea today"]
+    assert kept("great idea", "good idea") == ["great idea", "good idea"]
+    assert kept("oh no", "oh no") == ["oh no", "oh no"]
+    # Longer segments still go through the full score
+    assert kept("we need to talk about the project", "we need to talk about the project") == ["we need to talk about the project"]
+
+
+CHAR_FILTER_TEXTS = [
+    "", "Hello, world!", "don't stop_me now... 42%", "tabs\tand\nnewlines -- (ok)?",
+    "Café, naïve résumé!", "em—dash “quoted” 'single'", "日本語、テスト。", "control\x0b\x0c\x1c\x1f\x7f chars", "~`@#$^&*+=|\\/<>[]{}",
+]
+
+
+def test_char_filter_matches_the_regex():
+    for pattern in (r'[^\w\s]', r"[^\w\s']", r'[^\w]', r"[^\w']"):
+        char_filter = _CharFilter(pattern)
+        for text in CHAR_FILTER_TEXTS:
+            assert char_filter.delete(text) == re.sub(pattern, '', text), (pattern, text)
+
+
+def finalized(rough_cut, segments):
+    final = rough_cut._finalize_segments(segments)
+    # The NumPy padding of the whole cut agrees with the per-segment one
+    assert [(seg['start'], seg['end']) for seg in final] == list(zip(rough_cut._seg_starts.tolist(), rough_cut._seg_ends.tolist()))
+    return [(seg['word_indices'], seg['text'], round(seg['start'], 3), round(seg['end'], 3)) for seg in final]
+
+
+def test_finalize_drops_deleted_words_and_pads_segments():
+    rough_cut = ProfessionalRoughCutV2(make_words("zero one two three four five six seven eight nine", deleted={1, 5, 6, 7}))
+    segments = [
+        make_segment(rough_cut, [2, 3, 4]),        # Nothing deleted
+        make_segment(rough_cut, [0, 1, 2, 3]),     # One deleted; starts at 0s, so no padding before
+        make_segment(rough_cut, [4, 5, 6, 7]),     # One word left: skipped
+        make_segment(rough_cut, [3, 5, 8, 9]),     # Gap in the indices, and one deleted
+        make_segment(rough_cut, [5, 6, 7, 8]),     # Deleted words only in the first part
+        make_segment(rough_cut, []),
+    ]
+
+    assert finalized(rough_cut, segments) == [
+        ([2, 3, 4], "two three four", 0.65, 2.05),
+        ([0, 2, 3], "zero two three", 0.0, 1.65),
+        ([3, 8, 9], "three eight nine", 1.05, 4.05),
+    ]
+
+
+def test_finalize_without_deleted_words_keeps_segments_whole():
+    rough_cut = ProfessionalRoughCutV2(make_words("zero one two three four"))
+    segments = [make_segment(rough_cut, [0, 1, 2]), make_segment(rough_cut, [3, 4]), make_segment(rough_cut, [1, 3, 4])]
+
+    assert finalized(rough_cut, segments) == [([0, 1, 2], "zero one two", 0.0, 1.25), ([1, 3, 4], "one three four", 0.25, 2.05)]
@@ -0,0 +1,38 @@
+import pytest
+
+from core.thought_grouper import ThoughtGrouper
+
+
+PHRASE = "we need to finish the edit before the deadline"
+
+EXACT_PHRASE_CASES = [
+    # An 8-word run in common, in a longer text
+    (PHRASE, "honestly " + PHRASE + " tomorrow", True),
+    # Case is ignored
+    (PHRASE, PHRASE.upper(), True),
+    # Only 7 words in common
+    ("so we need to finish the edit before", "but we need to finish the edit today", False),
+    # Fewer than 8 words in either text
+    ("we need to finish the edit", "we need to finish the edit", False),
+    (PHRASE, "we need to finish", False),
+    # The first and last word of a window only have to be part of a word in the other text
+    ("go to the store and buy some milk", "let's ongo to the store and buy some milkshakes", True),
+    # ...but the inner ones are whole words there
+    ("go to the store and buy some milk", "go to the storehouse and buy some milk", False),
+    # A word missing from the other text, before the common run
+    ("um okay so " + PHRASE, PHRASE, True),
+    # ...after it
+    (PHRASE + " um okay so", "and " + PHRASE, True),
+    # ...and inside it, leaving 7 words in common on one side and 6 on the other
+    ("we need to finish the edit before um the deadline so we can ship it", "we need to finish the edit before the deadline so we can ship it", False),
+    # Same words, not in the same order
+    (PHRASE, "the deadline before the edit finish to need we", False),
+]
+
+
+@pytest.mark.parametrize("text1, text2, expected", EXACT_PHRASE_CASES)
+def test_exact_phrase_match(text1, text2, expected):
+    grouper = ThoughtGrouper([])
+    assert grouper._check_exact_phrase_match(text1, text2) == expected
+    # With the other text's word set passed in, as _classify_thought_types does
+    assert grouper._shares_exact_phrase(text1.lower().split(), text2.lower(), set(text2.lower().split())) == expected